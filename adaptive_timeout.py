@@ -0,0 +1,100 @@
+"""Per-slave response timeouts derived from the measured round trip time, like TCP's retransmission timer.
+
+For each slave a smoothed RTT (SRTT) and RTT variation (RTTVAR) are kept as in RFC 6298, and the
+timeout is SRTT + k * RTTVAR clamped to [floor, ceiling]. A timed-out request doubles the slave's
+timeout until the next successful sample (Karn's backoff), so a too small estimate corrects itself.
+
+    gripper = GripperControl(port, timeout_estimator=AdaptiveTimeout(floor=0.002, ceiling=0.05))
+    print(gripper.calibrate_timeouts())  # {2: 0.0031, 10: 0.0029}
+"""
+import math
+
+
+class AdaptiveTimeout:
+    def __init__(self, initial: float = 0.005, floor: float = 0.002, ceiling: float = 0.1,
+                 alpha: float = 0.125, beta: float = 0.25, k: float = 4.0, resolution: float = 0.0005):
+        """
+        :param initial: Timeout of a slave without samples, in seconds.
+        :param floor: Lowest timeout ever used.
+        :param ceiling: Highest timeout ever used, also the limit of the backoff.
+        :param alpha: Weight of a new sample in SRTT (RFC 6298 uses 1/8).
+        :param beta: Weight of a new sample in RTTVAR (RFC 6298 uses 1/4).
+        :param k: Number of RTTVARs added to SRTT.
+        :param resolution: Timeouts are rounded up to a multiple of this, so the serial port is reconfigured
+            only when the estimate moves noticeably.
+        """
+        if not 0 < floor <= ceiling:
+            raise ValueError("floor must be positive and not above ceiling")
+        self.initial = initial
+        self.floor = floor
+        self.ceiling = ceiling
+        self.alpha = alpha
+        self.beta = beta
+        self.k = k
+        self.resolution = resolution
+        self._srtt = {}  # slave -> seconds
+        self._rttvar = {}
+        self._backoff = {}  # slave -> multiplier after timeouts
+        self._samples = {}
+        self._timeouts = {}
+
+    def observe(self, slave: int, rtt: float):
+        """Add the round trip time of a request that got a response."""
+        srtt = self._srtt.get(slave)
+        if srtt is None:
+            self._srtt[slave] = rtt
+            self._rttvar[slave] = rtt / 2
+        else:
+            self._rttvar[slave] += self.beta * (abs(srtt - rtt) - self._rttvar[slave])
+            self._srtt[slave] = srtt + self.alpha * (rtt - srtt)
+        self._backoff[slave] = 1
+        self._samples[slave] = self._samples.get(slave, 0) + 1
+
+    def timed_out(self, slave: int):
+        """A request got no response: double the slave's timeout until the next sample."""
+        self._backoff[slave] = min(self._backoff.get(slave, 1) * 2, 64)
+        self._timeouts[slave] = self._timeouts.get(slave, 0) + 1
+
+    def timeout(self, slave: int) -> float:
+        srtt = self._srtt.get(slave)
+        base = self.initial if srtt is None else srtt + self.k * self._rttvar[slave]
+        timeout = min(self.ceiling, max(self.floor, base * self._backoff.get(slave, 1)))
+        return min(self.ceiling, round(math.ceil(timeout / self.resolution) * self.resolution, 6))
+
+    def reset(self, slave: int = None):
+        """Forget the estimate of one slave (default all), e.g. after the cable or adapter changed."""
+        for table in (self._srtt, self._rttvar, self._backoff, self._samples, self._timeouts):
+            if slave is None:
+                table.clear()
+            else:
+                table.pop(slave, None)
+
+    def stats(self) -> dict:
+        """{slave: {srtt_ms, rttvar_ms, timeout_ms, samples, timeouts}}"""
+        return {
+            slave: {
+                "srtt_ms": self._srtt[slave] * 1000,
+                "rttvar_ms": self._rttvar[slave] * 1000,
+                "timeout_ms": self.timeout(slave) * 1000,
+                "samples": self._samples.get(slave, 0),
+                "timeouts": self._timeouts.get(slave, 0),
+            }
+            for slave in self._srtt
+        }
+
+
+def calibrate_timeouts(gripper, samples: int = 20) -> dict:
+    """Probe both grippers of a GripperControl with position reads to seed its timeout estimator.
+    Timeouts during the probe back the estimate off, so a too small initial timeout is corrected as well.
+    :return: {slave: timeout in seconds}
+    """
+    estimator = gripper.timeout_estimator
+    slaves = (gripper.left_address, gripper.right_address)
+    for slave in slaves:
+        estimator.reset(slave)
+        for _ in range(samples):
+            try:
+                gripper._read_modbus_register(slave, gripper.pos_register_address, 1)
+            except Exception:
+                pass  # counted as a timeout by the bus transaction
+    return {slave: estimator.timeout(slave) for slave in slaves}
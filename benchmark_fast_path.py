@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Compare the position read/write of the fast RTU path (fast_path=True) against the pymodbus path.
+
+Reports the wall latency and the CPU time of the calling thread per call. The CPU time is what the fast
+path saves; with real grippers the latency is dominated by the line and the slaves' response time.
+
+example run:
+
+% ./benchmark_fast_path.py --simulate --iterations 2000
+"""
+import argparse
+import json
+import time
+
+from e_gripper_mudbus_control_one_init import GripperControl
+
+
+OPERATIONS = ("read", "write")
+
+
+def _operation(gripper: GripperControl, name: str):
+    address = gripper.left_address
+    if name == "read":
+        return lambda step: gripper._read_modbus_register(address, gripper.pos_register_address, 1)
+    positions = (gripper.RAW_MIN_POSITION, gripper.RAW_MAX_POSITION)
+    return lambda step: gripper._send_modbus_command(address, gripper.pos_register_address, positions[step & 1])
+
+
+def run(port: str, baudrate: int, timeout: float, fast_path: bool, operation: str, iterations: int, warmup: int) -> dict:
+    gripper = GripperControl(port=port, baudrate=baudrate, timeout=timeout, shadow_registers=False,
+                             fast_path=fast_path, lazy=False)
+    try:
+        call = _operation(gripper, operation)
+        for step in range(warmup):
+            call(step)
+        latencies = []
+        errors = 0
+        cpu_start = time.thread_time()  # this thread only, so a simulator thread in the process is not counted
+        for step in range(iterations):
+            start = time.perf_counter()
+            try:
+                result = call(step)
+            except Exception:
+                result = None
+            latencies.append(time.perf_counter() - start)
+            errors += result is None or result is False
+        cpu_time = time.thread_time() - cpu_start
+    finally:
+        gripper.close()
+    latencies.sort()
+    return {
+        "path": "fast" if fast_path else "pymodbus",
+        "operation": operation,
+        "iterations": iterations,
+        "errors": errors,
+        "cpu_us_per_call": cpu_time / iterations * 1e6,
+        "mean_ms": sum(latencies) / iterations * 1000,
+        "p50_ms": latencies[iterations // 2] * 1000,
+        "p99_ms": latencies[min(iterations - 1, int(iterations * 0.99))] * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", default="/dev/ttyUSB_girpper")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--timeout", type=float, default=0.005)
+    parser.add_argument("--operation", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--json", help="write machine-readable results to this file ('-' for stdout)")
+    parser.add_argument("--simulate", action="store_true", help="benchmark against gripper_simulator instead of --port")
+    args = parser.parse_args()
+
+    simulator = None
+    port = args.port
+    if args.simulate:
+        from gripper_simulator import GripperSimulator
+
+        simulator = GripperSimulator()
+        port = simulator.start()
+        args.timeout = max(args.timeout, 0.02)
+    try:
+        results = [
+            run(port, args.baudrate, args.timeout, fast_path, operation, args.iterations, args.warmup)
+            for operation in args.operation
+            for fast_path in (False, True)
+        ]
+    finally:
+        if simulator is not None:
+            simulator.stop()
+
+    for result in results:
+        print(f"{result['operation']:5} {result['path']:8}  cpu {result['cpu_us_per_call']:7.1f} us/call  "
+              f"mean {result['mean_ms']:6.3f} ms  p50 {result['p50_ms']:6.3f} ms  p99 {result['p99_ms']:6.3f} ms  "
+              f"errors {result['errors']}")
+    if args.json:
+        payload = json.dumps(results, indent=2)
+        if args.json == "-":
+            print(payload)
+        else:
+            with open(args.json, "w") as f:
+                f.write(payload)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Compare read_all_info_oneside (block reads) against one read per register.
+
+Counts the Modbus round trips and the wall time of each path.
+
+example run:
+
+% ./benchmark_read_all_info.py --port /dev/ttyUSB_girpper --loops 100
+"""
+import argparse
+import time
+
+from e_gripper_mudbus_control_one_init import GripperControl
+
+
+def count_round_trips(gripper: GripperControl):
+    """Wrap the client's read_holding_registers so every request is counted."""
+    counter = {"requests": 0}
+    read_holding_registers = gripper.client.read_holding_registers
+
+    def counted(*args, **kwargs):
+        counter["requests"] += 1
+        return read_holding_registers(*args, **kwargs)
+
+    gripper.client.read_holding_registers = counted
+    return counter
+
+
+def read_all_info_per_register(gripper: GripperControl, side_address: int):
+    """The former read_all_info_oneside: one request per register."""
+    return [
+        gripper._read_modbus_register(id_address=side_address, register_address=address, num_registers=1)
+        for address in gripper.INFO_REGISTER_ADDRESSES
+    ]
+
+
+def run_benchmark(gripper: GripperControl, name: str, read_fn, side_addresses, loops: int):
+    counter = count_round_trips(gripper)
+    start_time = time.perf_counter()
+    for _i in range(loops):
+        for side_address in side_addresses:
+            read_fn(side_address)
+    run_time = time.perf_counter() - start_time
+    del gripper.client.read_holding_registers  # drop the counting wrapper
+    calls = loops * len(side_addresses)
+    print(
+        f"--- {name}: {counter['requests'] / calls:5.2f} round trips/call, "
+        f"{run_time / calls * 1000:6.2f} ms/call"
+    )
+    return counter["requests"], run_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", default="/dev/ttyUSB_girpper")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--loops", type=int, default=100)
+    args = parser.parse_args()
+
+    gripper = GripperControl(port=args.port, baudrate=args.baudrate)
+    sides = (gripper.LEFT_ADDRESS, gripper.RIGHT_ADDRESS)
+    print(f"Read plan: {gripper.INFO_READ_PLAN}")
+    run_benchmark(gripper, "per-register", lambda side: read_all_info_per_register(gripper, side), sides, args.loops)
+    run_benchmark(gripper, "block read  ", lambda side: gripper.read_all_info_oneside(side, verbose=False), sides, args.loops)
+    gripper.close()
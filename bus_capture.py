@@ -0,0 +1,329 @@
+"""Record the frames exchanged with the grippers and replay them without hardware.
+
+A capture stores every request written to the port and every response read from it, with its time, in a
+compact binary file. A ReplaySerial plays such a file back as the gripper side of the bus, answering each
+request with its recorded response after the recorded delay (or at once), so changes to retries, timeouts
+or batching can be benchmarked offline against a field session:
+
+    with BusCapture("session.bin") as capture:
+        gripper = GripperControl(port, capture=capture)
+        ...
+
+    gripper = GripperControl(port, transport=ReplaySerial("session.bin"))
+
+% python bus_capture.py session.bin   # summary of a capture
+"""
+import argparse
+import struct
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+
+MAGIC = b"MBCAP"
+VERSION = 1
+TX = 0  # request written to the port
+RX = 1  # response read from the port
+
+# magic, version, wall clock time of the start, baudrate
+_HEADER = struct.Struct("<5sBdI")
+# seconds since the start, direction, frame length
+_RECORD = struct.Struct("<dBH")
+
+
+class Frame(NamedTuple):
+    time: float  # seconds since the start of the capture; responses: earliest time they can have been complete
+    direction: int  # TX or RX
+    data: bytes
+
+
+class CaptureInfo(NamedTuple):
+    started: float  # time.time() of the start
+    baudrate: int
+    frames: list
+
+
+class BusCapture:
+    """Writes the frames of a bus session to a capture file.
+    Consecutive reads without a request in between are stored as one response frame.
+    """
+
+    def __init__(self, path: str, baudrate: int = 0):
+        self.path = path
+        self.frames = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, time.time(), baudrate))
+        self._start = time.perf_counter()
+        self._response = bytearray()
+        self._response_time = 0.0
+        self._waiting = 0  # bytes the port last reported waiting
+        self._waiting_time = None  # when they arrived at the latest
+        self._poll_time = None  # last in_waiting poll since the request
+        self._lock = threading.Lock()
+
+    def attach(self, client):
+        """Record the traffic of a connected pymodbus client. Safe to call again after the client reopened its port."""
+        socket = client.socket
+        if socket is not None and not isinstance(socket, CaptureSerial):
+            client.socket = CaptureSerial(socket, self)
+
+    def request(self, data):
+        with self._lock:
+            self._flush_response()
+            self._poll_time = None
+            self._write(time.perf_counter() - self._start, TX, data)
+
+    def waiting(self, count: int):
+        """Note the port's in_waiting. pymodbus polls it, so this dates a response closer to its arrival than the read.
+        New bytes are dated at the previous poll, the earliest they can have arrived: a replay then makes them
+        visible to the same poll that saw them originally.
+        """
+        now = time.perf_counter()
+        if count > self._waiting:
+            self._waiting = count
+            self._waiting_time = self._poll_time if self._poll_time is not None else now
+        self._poll_time = now
+
+    def response(self, data):
+        with self._lock:
+            self._response += data
+            arrived = self._waiting_time if self._waiting_time is not None else time.perf_counter()
+            self._response_time = arrived - self._start
+            self._waiting = 0
+            self._waiting_time = None
+
+    def _flush_response(self):
+        if self._response:
+            self._write(self._response_time, RX, self._response)
+            self._response.clear()
+
+    def _write(self, timestamp: float, direction: int, data):
+        self._file.write(_RECORD.pack(timestamp, direction, len(data)))
+        self._file.write(data)
+        self.frames += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush_response()
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CaptureSerial:
+    """pyserial port proxy that hands everything written and read to a BusCapture."""
+
+    def __init__(self, serial, capture: BusCapture):
+        object.__setattr__(self, "_serial", serial)
+        object.__setattr__(self, "_capture", capture)
+
+    def write(self, data):
+        self._capture.request(data)
+        return self._serial.write(data)
+
+    def read(self, size: int = 1) -> bytes:
+        data = self._serial.read(size)
+        if data:
+            self._capture.response(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        count = self._serial.readinto(buffer)
+        if count:
+            self._capture.response(buffer[:count])
+        return count
+
+    @property
+    def in_waiting(self) -> int:
+        count = self._serial.in_waiting
+        self._capture.waiting(count)
+        return count
+
+    def __getattr__(self, name):
+        return getattr(self._serial, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._serial, name, value)  # e.g. the timeout, set by GripperControl._set_timeout
+
+
+def load_capture(path: str) -> CaptureInfo:
+    """Read a capture file. A file cut short (the process died while recording) loads up to its last whole frame."""
+    with open(path, "rb") as file:
+        content = file.read()
+    magic, version, started, baudrate = _HEADER.unpack_from(content, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} bus capture.")
+    frames = []
+    offset = _HEADER.size
+    while offset + _RECORD.size <= len(content):
+        timestamp, direction, length = _RECORD.unpack_from(content, offset)
+        offset += _RECORD.size
+        if offset + length > len(content):
+            break
+        frames.append(Frame(timestamp, direction, content[offset:offset + length]))
+        offset += length
+    return CaptureInfo(started, baudrate, frames)
+
+
+class ReplayMismatch(IOError):
+    """A request that the capture does not contain (ReplaySerial with strict=True)."""
+
+
+class ReplaySerial:
+    """pyserial compatible port that answers requests with the responses of a capture.
+
+    Each written request is matched against the next recorded requests; the responses recorded after the match
+    become readable after their recorded delay (realtime=True) or immediately. A request without a match within
+    `lookahead` recorded requests is not answered, like a silent slave, and counted in `mismatches`, or raises
+    ReplayMismatch with strict=True. Requests skipped by the code under test (coalesced or shadowed writes)
+    are passed over.
+    """
+
+    def __init__(self, capture, realtime: bool = True, lookahead: int = 16, strict: bool = False, timeout: float = 0.005):
+        """
+        :param capture: Capture file path, or a CaptureInfo from load_capture().
+        :param realtime: Delay each response as recorded instead of answering at once.
+        """
+        info = load_capture(capture) if isinstance(capture, str) else capture
+        self.frames = info.frames
+        self.baudrate = info.baudrate
+        self.realtime = realtime
+        self.lookahead = lookahead
+        self.strict = strict
+        self.timeout = timeout
+        self.inter_byte_timeout = None
+        self.is_open = True
+        self.requests = 0
+        self.mismatches = 0
+        self._position = 0  # index of the next recorded frame
+        self._responses = deque()  # [time readable, bytearray] in arrival order
+
+    def _match(self, data: bytes):
+        """Index of the recorded request equal to data, None if there is none within the lookahead."""
+        frames = self.frames
+        seen = 0
+        index = self._position
+        while index < len(frames) and seen < self.lookahead:
+            frame = frames[index]
+            if frame.direction == TX:
+                if frame.data == data:
+                    return index
+                seen += 1
+            index += 1
+        return None
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        now = time.perf_counter()
+        self.requests += 1
+        index = self._match(data)
+        if index is None:
+            self.mismatches += 1
+            if self.strict:
+                raise ReplayMismatch(f"Request {data.hex()} not found after frame {self._position} of the capture")
+            return len(data)
+        request = self.frames[index]
+        index += 1
+        while index < len(self.frames) and self.frames[index].direction == RX:
+            response = self.frames[index]
+            delay = response.time - request.time if self.realtime else 0.0
+            self._responses.append([now + delay, bytearray(response.data)])
+            index += 1
+        self._position = index
+        return len(data)
+
+    @property
+    def in_waiting(self) -> int:
+        now = time.perf_counter()
+        return sum(len(data) for ready, data in self._responses if ready <= now)
+
+    def read(self, size: int = 1) -> bytes:
+        """Up to size bytes, waiting for them at most self.timeout like pyserial."""
+        deadline = time.perf_counter() + (self.timeout or 0.0)
+        result = bytearray()
+        while len(result) < size:
+            if not self._responses:
+                break
+            ready, data = self._responses[0]
+            wait_time = ready - time.perf_counter()
+            if wait_time > 0:
+                if ready > deadline:
+                    time.sleep(max(0.0, deadline - time.perf_counter()))
+                    break
+                time.sleep(wait_time)
+            taken = data[:size - len(result)]
+            result += taken
+            del data[:len(taken)]
+            if not data:
+                self._responses.popleft()
+        return bytes(result)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def reset_input_buffer(self):
+        now = time.perf_counter()
+        while self._responses and self._responses[0][0] <= now:
+            self._responses.popleft()
+
+    def flush(self):
+        pass
+
+    def open(self):
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+    @property
+    def remaining(self) -> int:
+        """Recorded frames not replayed yet."""
+        return len(self.frames) - self._position
+
+
+def summarize(info: CaptureInfo) -> dict:
+    """Frame counts and response delays of a capture, delays in milliseconds."""
+    frames = info.frames
+    delays = []
+    unanswered = 0
+    for index, frame in enumerate(frames):
+        if frame.direction != TX:
+            continue
+        if index + 1 < len(frames) and frames[index + 1].direction == RX:
+            delays.append((frames[index + 1].time - frame.time) * 1000)
+        else:
+            unanswered += 1
+    delays.sort()
+    return {
+        "frames": len(frames),
+        "requests": len(frames) - sum(frame.direction for frame in frames),
+        "unanswered": unanswered,
+        "duration_s": frames[-1].time if frames else 0.0,
+        "delay_p50_ms": delays[len(delays) // 2] if delays else None,
+        "delay_p99_ms": delays[min(len(delays) - 1, int(len(delays) * 0.99))] if delays else None,
+        "delay_max_ms": delays[-1] if delays else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a bus capture.")
+    parser.add_argument("path")
+    parser.add_argument("--frames", action="store_true", help="also print every frame")
+    args = parser.parse_args()
+
+    info = load_capture(args.path)
+    if args.frames:
+        for frame in info.frames:
+            print(f"{frame.time * 1000:10.3f} ms  {'>>' if frame.direction == TX else '<<'}  {frame.data.hex(' ')}")
+    print(f"Captured {time.ctime(info.started)}" + (f" at {info.baudrate} baud" if info.baudrate else ""))
+    for key, value in summarize(info).items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
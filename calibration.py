@@ -0,0 +1,83 @@
+"""Percent <-> raw position calibration of one gripper.
+
+A calibration is a piecewise-linear lookup table from opening percent to raw position register value.
+Scalars are mapped in plain Python (no NumPy import on the control path); arrays and lists are mapped
+with NumPy in one vectorized call:
+
+    calibration = GripperCalibration.linear(raw_at_0=100, raw_at_100=580)
+    calibration.to_raw(50)                       # 340
+    calibration.to_percent(np.array([100, 340]))  # array([ 0., 50.])
+"""
+from bisect import bisect_right
+from numbers import Real
+
+
+DEFAULT_RAW_AT_0 = 100  # raw position at 0%
+DEFAULT_RAW_AT_100 = 580  # raw position at 100%
+
+
+def _interpolate(x: float, xs, ys) -> float:
+    """Piecewise-linear interpolation on increasing xs, clamped to the end points like numpy.interp."""
+    if x <= xs[0]:
+        return ys[0]
+    if x >= xs[-1]:
+        return ys[-1]
+    i = bisect_right(xs, x) - 1
+    return ys[i] + (ys[i + 1] - ys[i]) * (x - xs[i]) / (xs[i + 1] - xs[i])
+
+
+class GripperCalibration:
+    def __init__(self, raw_points, percent_points=None):
+        """
+        :param raw_points: Raw positions of the table, strictly increasing or strictly decreasing.
+        :param percent_points: Percent of each raw point, strictly increasing (default: evenly spaced 0-100).
+        """
+        raw_points = [float(raw) for raw in raw_points]
+        if len(raw_points) < 2:
+            raise ValueError("A calibration needs at least two points.")
+        if percent_points is None:
+            percent_points = [100.0 * i / (len(raw_points) - 1) for i in range(len(raw_points))]
+        percent_points = [float(percent) for percent in percent_points]
+        if len(percent_points) != len(raw_points):
+            raise ValueError("raw_points and percent_points must have the same length.")
+        if any(b <= a for a, b in zip(percent_points, percent_points[1:])):
+            raise ValueError("percent_points must be strictly increasing.")
+        steps = [b - a for a, b in zip(raw_points, raw_points[1:])]
+        if not (all(step > 0 for step in steps) or all(step < 0 for step in steps)):
+            raise ValueError("raw_points must be strictly monotonic.")
+
+        self.percent_points = percent_points
+        self.raw_points = raw_points
+        # Inverse table, sorted by raw position
+        if steps[0] > 0:
+            self._inverse_raw, self._inverse_percent = raw_points, percent_points
+        else:
+            self._inverse_raw, self._inverse_percent = raw_points[::-1], percent_points[::-1]
+
+    @classmethod
+    def linear(cls, raw_at_0: float = DEFAULT_RAW_AT_0, raw_at_100: float = DEFAULT_RAW_AT_100):
+        return cls([raw_at_0, raw_at_100], [0.0, 100.0])
+
+    @property
+    def raw_range(self):
+        """(lowest, highest) raw position of the table."""
+        return self._inverse_raw[0], self._inverse_raw[-1]
+
+    def to_raw(self, percent):
+        """Map percent to raw position. Scalars return an int (truncated like map_position), arrays an int array."""
+        if isinstance(percent, Real):
+            return int(_interpolate(percent, self.percent_points, self.raw_points))
+        import numpy as np
+
+        return np.trunc(np.interp(percent, self.percent_points, self.raw_points)).astype(np.int64)
+
+    def to_percent(self, raw):
+        """Map raw position to percent. Scalars return a float, arrays a float array."""
+        if isinstance(raw, Real):
+            return _interpolate(raw, self._inverse_raw, self._inverse_percent)
+        import numpy as np
+
+        return np.interp(raw, self._inverse_raw, self._inverse_percent)
+
+    def __repr__(self):
+        return f"GripperCalibration(raw_points={self.raw_points}, percent_points={self.percent_points})"
@@ -1,83 +1,234 @@
 #!/usr/bin/env python3
-"""Test performance of client: sync vs. async.
+"""Benchmark GripperControl operations: latency percentiles per scenario, client, baudrate and timeout.
 
-This example show how much faster the async version is.
+Every combination of --scenario, --client, --baudrate and --timeout is run after a warmup,
+and the min/mean/p50/p95/p99/max latency and a latency histogram are reported.
 
 example run:
 
-(pymodbus) % ./client_performance.py
---- Testing sync client v3.4.1
-running 1000 call (each 10 registers), took 114.10 seconds
-Averages 114.10 ms pr call and 11.41 ms pr register.
---- Testing async client v3.4.1
-running 1000 call (each 10 registers), took 0.33 seconds
-Averages 0.33 ms pr call and 0.03 ms pr register.
+(pymodbus) % ./client_performance.py --scenario read_position write_read --client sync async --timeout 0.005 0.01
+(pymodbus) % ./client_performance.py --simulate --sim-latency 0.001 --json results.json
+
+The JSON output can be compared across releases, adapters and cable lengths.
 """
+import argparse
 import asyncio
+import json
+import platform
+import sys
 import time
 
-from pymodbus import FramerType
-from pymodbus.client import AsyncModbusSerialClient, ModbusSerialClient
-
-
-LOOP_COUNT = 1000
-REGISTER_COUNT = 10
-
-
-def run_sync_client_test():
-    """Run sync client."""
-    print("--- Testing sync client v3.4.1")
-    client = ModbusSerialClient(
-        "/dev/ttyUSB_girpper",
-        framer=FramerType.RTU,
-        baudrate=115200,
-    )
-    client.connect()
-    assert client.connected
-
-    start_time = time.time()
-    for _i in range(LOOP_COUNT):
-        rr = client.read_input_registers(1, count=REGISTER_COUNT, slave=1)
-        if rr.isError():
-            print(f"Received Modbus library error({rr})")
-            break
-    client.close()
-    run_time = time.time() - start_time
-    avg_call = (run_time / LOOP_COUNT) * 1000
-    avg_register = avg_call / REGISTER_COUNT
-    print(
-        f"running {LOOP_COUNT} call (each {REGISTER_COUNT} registers), took {run_time:.2f} seconds"
-    )
-    print(f"Averages {avg_call:.2f} ms pr call and {avg_register:.2f} ms pr register.")
-
-
-async def run_async_client_test():
-    """Run async client."""
-    print("--- Testing async client v3.4.1")
-    client = AsyncModbusSerialClient(
-        "/dev/ttyUSB_girpper",
-        framer=FramerType.RTU,
-        baudrate=115200,
-    )
-    await client.connect()
-    assert client.connected
-
-    start_time = time.time()
-    for _i in range(LOOP_COUNT):
-        rr = await client.read_input_registers(1, count=REGISTER_COUNT, slave=1)
-        if rr.isError():
-            print(f"Received Modbus library error({rr})")
-            break
-    client.close()
-    run_time = time.time() - start_time
-    avg_call = (run_time / LOOP_COUNT) * 1000
-    avg_register = avg_call / REGISTER_COUNT
-    print(
-        f"running {LOOP_COUNT} call (each {REGISTER_COUNT} registers), took {run_time:.2f} seconds"
-    )
-    print(f"Averages {avg_call:.2f} ms pr call and {avg_register:.2f} ms pr register.")
+import pymodbus
+
+from e_gripper_mudbus_control_one_init import AsyncGripperControl, GripperControl
+
+
+DEFAULT_PORT = "/dev/ttyUSB_girpper"
+HISTOGRAM_BUCKETS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+# Each scenario is called with (gripper, step) and returns whether the operation succeeded
+def _raw_read(gripper, step):
+    response = gripper.client.read_holding_registers(gripper.POS_REGISTER_ADDRESS, count=1, slave=gripper.LEFT_ADDRESS)
+    return not response.isError()
+
+
+def _read_position(gripper, step):
+    return None not in gripper.read_position()
+
+
+def _set_position_percent(gripper, step):
+    left_raw, right_raw = gripper.map_positions(step % 101)
+    return all(gripper.set_position_raw_direct(left_raw, right_position=right_raw))
+
+
+def _read_all_info(gripper, step):
+    return None not in gripper.read_all_info_oneside(gripper.LEFT_ADDRESS, verbose=False)
+
+
+def _write_read(gripper, step):
+    gripper.set_position_percent(step % 101)
+    return None not in gripper.read_position()
+
+
+async def _async_raw_read(gripper, step):
+    response = await gripper.client.read_holding_registers(gripper.POS_REGISTER_ADDRESS, count=1, slave=gripper.LEFT_ADDRESS)
+    return not response.isError()
+
+
+async def _async_read_position(gripper, step):
+    return None not in await gripper.read_position()
+
+
+async def _async_set_position_percent(gripper, step):
+    return all(await gripper.set_position_percent(step % 101))
+
+
+async def _async_read_all_info(gripper, step):
+    return None not in await gripper.read_all_info_oneside(gripper.LEFT_ADDRESS, verbose=False)
+
+
+async def _async_write_read(gripper, step):
+    await gripper.set_position_percent(step % 101)
+    return None not in await gripper.read_position()
+
+
+# scenario -> (sync operation, async operation)
+SCENARIOS = {
+    "raw_read": (_raw_read, _async_raw_read),
+    "read_position": (_read_position, _async_read_position),
+    "set_position_percent": (_set_position_percent, _async_set_position_percent),
+    "read_all_info": (_read_all_info, _async_read_all_info),
+    "write_read": (_write_read, _async_write_read),
+}
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors: int) -> dict:
+    """Latency statistics in milliseconds."""
+    values = sorted(latency * 1000 for latency in latencies)
+    histogram = {f"<={bucket}": 0 for bucket in HISTOGRAM_BUCKETS_MS}
+    histogram["inf"] = 0
+    for value in values:
+        for bucket in HISTOGRAM_BUCKETS_MS:
+            if value <= bucket:
+                histogram[f"<={bucket}"] += 1
+                break
+        else:
+            histogram["inf"] += 1
+    return {
+        "iterations": len(values),
+        "errors": errors,
+        "min_ms": values[0],
+        "mean_ms": sum(values) / len(values),
+        "p50_ms": percentile(values, 0.50),
+        "p95_ms": percentile(values, 0.95),
+        "p99_ms": percentile(values, 0.99),
+        "max_ms": values[-1],
+        "histogram_ms": histogram,
+    }
+
+
+def _call(operation, gripper, step) -> bool:
+    try:
+        return bool(operation(gripper, step))
+    except Exception:
+        return False
+
+
+def run_sync_scenario(port: str, scenario: str, baudrate: int, timeout: float, iterations: int, warmup: int) -> dict:
+    operation = SCENARIOS[scenario][0]
+    gripper = GripperControl(port=port, baudrate=baudrate, timeout=timeout)
+    try:
+        for step in range(warmup):
+            _call(operation, gripper, step)
+        latencies = []
+        errors = 0
+        for step in range(iterations):
+            start_time = time.perf_counter()
+            ok = _call(operation, gripper, step)
+            latencies.append(time.perf_counter() - start_time)
+            errors += not ok
+    finally:
+        gripper.close()
+    return summarize(latencies, errors)
+
+
+async def run_async_scenario(port: str, scenario: str, baudrate: int, timeout: float, iterations: int, warmup: int) -> dict:
+    operation = SCENARIOS[scenario][1]
+    gripper = AsyncGripperControl(port=port, baudrate=baudrate, timeout=timeout)
+    await gripper.connect()
+
+    async def call(step):
+        try:
+            return bool(await operation(gripper, step))
+        except Exception:
+            return False
+
+    try:
+        for step in range(warmup):
+            await call(step)
+        latencies = []
+        errors = 0
+        for step in range(iterations):
+            start_time = time.perf_counter()
+            ok = await call(step)
+            latencies.append(time.perf_counter() - start_time)
+            errors += not ok
+    finally:
+        gripper.close()
+    return summarize(latencies, errors)
+
+
+def run_benchmarks(port: str, scenarios, clients, baudrates, timeouts, iterations: int, warmup: int):
+    results = []
+    for scenario in scenarios:
+        for client in clients:
+            for baudrate in baudrates:
+                for timeout in timeouts:
+                    if client == "sync":
+                        stats = run_sync_scenario(port, scenario, baudrate, timeout, iterations, warmup)
+                    else:
+                        stats = asyncio.run(run_async_scenario(port, scenario, baudrate, timeout, iterations, warmup))
+                    result = {"scenario": scenario, "client": client, "baudrate": baudrate, "timeout": timeout, **stats}
+                    print(
+                        f"--- {scenario:<20} {client:<5} {baudrate:>7} baud, timeout {timeout:g} s: "
+                        f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+                        f"p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms, "
+                        f"{result['errors']}/{iterations} errors"
+                    )
+                    results.append(result)
+    return results
 
 
 if __name__ == "__main__":
-    # run_sync_client_test()
-    asyncio.run(run_async_client_test())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", default=DEFAULT_PORT)
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--client", nargs="+", choices=("sync", "async"), default=["sync"])
+    parser.add_argument("--baudrate", nargs="+", type=int, default=[115200])
+    parser.add_argument("--timeout", nargs="+", type=float, default=[0.005])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--json", help="write machine-readable results to this file ('-' for stdout)")
+    parser.add_argument("--simulate", action="store_true", help="benchmark against gripper_simulator instead of --port")
+    parser.add_argument("--sim-latency", type=float, default=0.0, help="simulator response delay in seconds")
+    parser.add_argument("--sim-drop-rate", type=float, default=0.0, help="simulator probability of not answering")
+    args = parser.parse_args()
+
+    simulator = None
+    port = args.port
+    if args.simulate:
+        from gripper_simulator import GripperSimulator
+
+        simulator = GripperSimulator(latency=args.sim_latency, drop_rate=args.sim_drop_rate)
+        port = simulator.start()
+    try:
+        results = run_benchmarks(
+            port, args.scenario, args.client, args.baudrate, args.timeout, args.iterations, args.warmup
+        )
+    finally:
+        if simulator is not None:
+            simulator.stop()
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "pymodbus": pymodbus.__version__,
+            "python": platform.python_version(),
+            "port": "simulator" if args.simulate else args.port,
+            "simulator": {"latency": args.sim_latency, "drop_rate": args.sim_drop_rate} if args.simulate else None,
+            "warmup": args.warmup,
+            "results": results,
+        }
+        if args.json == "-":
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
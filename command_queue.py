@@ -0,0 +1,121 @@
+"""Non-blocking register writes that keep only the newest pending value per (slave, register).
+
+When commands arrive faster than the bus can drain them, older pending values are replaced instead of
+queued behind each other, so the value written is always the newest one and the delay from input to
+motor stays bounded by roughly one round trip per register.
+
+    queue = CoalescingCommandQueue(gripper)
+    queue.start()
+    queue.submit(2, 2, 300)  # returns immediately
+    print(queue.stats())
+
+A tuple of slaves with a tuple of values is one entry, written in one call of the send function, which then
+returns a success flag per slave.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class CoalescingCommandQueue:
+    def __init__(self, gripper, send=None, on_written=None):
+        """
+        :param gripper: GripperControl whose bus the writes go to.
+        :param send: Write function (slave, register_address, value) -> bool, default gripper._send_modbus_command.
+            For a tuple of slaves it gets the tuple of values and returns a tuple of flags.
+        :param on_written: Called from the worker as (slave, register_address, value, ok) after each write,
+            ok telling whether the bus acknowledged it. Entries of several slaves are reported per slave.
+        """
+        self.gripper = gripper
+        self._send = send if send is not None else gripper._send_modbus_command
+        self.on_written = on_written
+        self._pending = OrderedDict()  # (slave, register) -> (value, submit time)
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.submitted = 0
+        self.coalesced = 0  # pending values replaced by a newer one before they were written
+        self.written = 0
+        self.dropped = 0  # writes the bus did not acknowledge
+        self.total_latency = 0.0  # submit to write completion of written values
+        self.max_latency = 0.0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True):
+        """Stop the worker, after writing what is pending if flush is True."""
+        if self._thread is None:
+            return
+        with self._condition:
+            if not flush:
+                self._pending.clear()
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, slave, register_address: int, value):
+        """Queue a write without blocking. A pending value for the same register is replaced."""
+        key = (slave, register_address)
+        if isinstance(slave, tuple):
+            value = tuple(int(item) for item in value)
+            count = len(slave)  # counted per slave, like the writes
+        else:
+            value = int(value)
+            count = 1
+        with self._condition:
+            self.submitted += count
+            if key in self._pending:
+                self.coalesced += count
+            # Replacing keeps the key's place in line, so a busy register cannot starve the others
+            self._pending[key] = (value, time.perf_counter())
+            self._condition.notify()
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and self._running:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                (slave, register_address), (value, submit_time) = self._pending.popitem(last=False)
+            result = self._send(slave, register_address, value)
+            latency = time.perf_counter() - submit_time
+            if isinstance(slave, tuple):
+                writes = list(zip(slave, value, result))
+            else:
+                writes = [(slave, value, result)]
+            with self._condition:
+                for _slave, _value, ok in writes:
+                    if ok:
+                        self.written += 1
+                        self.total_latency += latency
+                        self.max_latency = max(self.max_latency, latency)
+                    else:
+                        self.dropped += 1
+            if self.on_written is not None:
+                for write_slave, write_value, ok in writes:
+                    self.on_written(write_slave, register_address, write_value, ok)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "written": self.written,
+                "dropped": self.dropped,
+                "pending": len(self._pending),
+                "mean_latency_ms": self.total_latency / self.written * 1000 if self.written else 0.0,
+                "max_latency_ms": self.max_latency * 1000,
+            }
@@ -0,0 +1,137 @@
+"""Link health monitoring and automatic reconnect of a GripperControl.
+
+After a USB-serial hiccup the serial handle stays open but every request fails. The monitor notices
+(consecutive failed requests, or a missed heartbeat while the bus is idle), reopens the port until a
+gripper answers again, and reports how long the link was down:
+
+    monitor = gripper.start_link_monitor(on_state_change=lambda old, new: print(old, "->", new))
+    ...
+    print(monitor.stats())
+"""
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+
+CONNECTED = "connected"
+DISCONNECTED = "disconnected"
+
+
+class Recovery(NamedTuple):
+    lost_at: float  # time.perf_counter() when the link was declared down
+    recovered_at: float
+    attempts: int  # reopen attempts until a gripper answered
+
+    @property
+    def downtime(self) -> float:
+        return self.recovered_at - self.lost_at
+
+
+class ConnectionMonitor:
+    def __init__(self, gripper, heartbeat_interval: float = 0.1, failure_threshold: int = 3,
+                 reconnect_interval: float = 0.01, max_reconnect_interval: float = 0.5, on_state_change=None):
+        """
+        :param gripper: GripperControl to watch. Its requests update gripper._link_failures and gripper._last_ok_time.
+        :param heartbeat_interval: Send a position read when the bus has had no successful request for this long.
+        :param failure_threshold: Consecutive failed requests after which the link is declared down.
+        :param reconnect_interval: First delay between reopen attempts, doubled up to max_reconnect_interval.
+        :param on_state_change: Called as on_state_change(old_state, new_state) from the monitor thread.
+        """
+        self.gripper = gripper
+        self.heartbeat_interval = heartbeat_interval
+        self.failure_threshold = failure_threshold
+        self.reconnect_interval = reconnect_interval
+        self.max_reconnect_interval = max_reconnect_interval
+        self.on_state_change = on_state_change
+        self.state = CONNECTED
+        self.disconnects = 0
+        self.recoveries = deque(maxlen=100)
+        self._lost_at = None
+        self._connected = threading.Event()
+        self._connected.set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def wait_connected(self, timeout: float = None) -> bool:
+        """Block until the link is up. :return: False on timeout."""
+        return self._connected.wait(timeout)
+
+    def _run(self):
+        # Checking at a fraction of the heartbeat interval bounds the detection delay
+        check_interval = self.heartbeat_interval / 4
+        while not self._stop.wait(check_interval):
+            if self.gripper._link_failures >= self.failure_threshold:
+                self._link_lost()
+                self._reconnect()
+            elif time.perf_counter() - self.gripper._last_ok_time >= self.heartbeat_interval:
+                self._heartbeat()
+
+    def _heartbeat(self) -> bool:
+        """One position read of the left gripper. The bus transaction updates the failure counters."""
+        try:
+            return self.gripper._read_modbus_register(self.gripper.left_address, self.gripper.pos_register_address, 1) is not None
+        except Exception:
+            return False
+
+    def _link_lost(self):
+        self._lost_at = time.perf_counter()
+        self.disconnects += 1
+        self._connected.clear()
+        self._set_state(DISCONNECTED)
+
+    def _reconnect(self):
+        delay = self.reconnect_interval
+        attempts = 0
+        while not self._stop.is_set():
+            attempts += 1
+            with self.gripper._bus_lock:
+                # A handle left over from before the hiccup never recovers, so always reopen
+                self.gripper.client.close()
+                opened = self.gripper.client.connect()
+            if opened and self._heartbeat():
+                break
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_interval)
+        else:
+            return
+        # Register values may have changed (e.g. a power cycle), so the shadow can't be trusted
+        self.gripper.invalidate_shadow()
+        self.gripper._link_failures = 0
+        self.recoveries.append(Recovery(self._lost_at, time.perf_counter(), attempts))
+        self._connected.set()
+        self._set_state(CONNECTED)
+
+    def _set_state(self, state: str):
+        old_state, self.state = self.state, state
+        if self.on_state_change is not None and old_state != state:
+            try:
+                self.on_state_change(old_state, state)
+            except Exception as e:
+                print(f"Link state callback failed: {e}")
+
+    def stats(self) -> dict:
+        """Disconnect count and time-to-recover of the recent recoveries, in milliseconds."""
+        downtimes = [recovery.downtime * 1000 for recovery in self.recoveries]
+        return {
+            "state": self.state,
+            "disconnects": self.disconnects,
+            "recoveries": len(downtimes),
+            "last_recovery_ms": downtimes[-1] if downtimes else None,
+            "mean_recovery_ms": sum(downtimes) / len(downtimes) if downtimes else None,
+            "max_recovery_ms": max(downtimes) if downtimes else None,
+        }
@@ -0,0 +1,78 @@
+"""Shared, lazily opened Modbus serial connections, one per (port, baudrate).
+
+Every user of a port acquires a reference; the serial port is opened on first use and closed when the
+last reference is released:
+
+    connection = SHARED_POOL.acquire("/dev/ttyUSB0", 115200)
+    with connection.client() as client:  # holds the port for one request
+        client.read_holding_registers(2, count=1, slave=2)
+    SHARED_POOL.release(connection)
+"""
+import threading
+from contextlib import contextmanager
+
+
+class PooledConnection:
+    """One serial port shared by every acquirer. Use client() to get the opened client under the port lock."""
+
+    def __init__(self, port: str, baudrate: int, timeout: float):
+        self.key = (port, baudrate)
+        self.timeout = timeout
+        self.references = 0
+        self._client = None
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def client(self):
+        """Yield the ModbusSerialClient, opening the port if needed. Errors close it so the next use reopens."""
+        with self._lock:
+            if self._client is None:
+                from pymodbus.client import ModbusSerialClient  # imported on first use to keep startup fast
+
+                port, baudrate = self.key
+                self._client = ModbusSerialClient(port=port, baudrate=baudrate, timeout=self.timeout)
+            if not self._client.connect():
+                raise ConnectionError(f"Failed to connect to the Modbus device on {self.key[0]}.")
+            try:
+                yield self._client
+            except Exception:
+                self.close()
+                raise
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+class ConnectionPool:
+    def __init__(self):
+        self._connections = {}  # (port, baudrate) -> PooledConnection
+        self._lock = threading.Lock()
+
+    def acquire(self, port: str, baudrate: int, timeout: float = 1.0) -> PooledConnection:
+        """Take a reference to the connection of (port, baudrate). The timeout of the first acquirer applies."""
+        with self._lock:
+            connection = self._connections.get((port, baudrate))
+            if connection is None:
+                connection = self._connections[(port, baudrate)] = PooledConnection(port, baudrate, timeout)
+            connection.references += 1
+            return connection
+
+    def release(self, connection: PooledConnection):
+        """Drop a reference. The port is closed when the last one is released."""
+        with self._lock:
+            connection.references -= 1
+            if connection.references > 0:
+                return
+            self._connections.pop(connection.key, None)
+        connection.close()
+
+    def open_ports(self):
+        """(port, baudrate) keys with at least one reference."""
+        with self._lock:
+            return list(self._connections)
+
+
+SHARED_POOL = ConnectionPool()
@@ -0,0 +1,156 @@
+"""High-rate recording of commanded and measured gripper positions.
+
+log() only stores into preallocated NumPy columns of a ring buffer; a background thread appends the
+new rows to one raw binary file per column, so the control loop never waits for the disk:
+
+    logger = DataLogger("runs/test1")
+    logger.start()
+    logger.log(time.perf_counter(), cmd_left, cmd_right, left_position, right_position, latency, errors)
+    logger.close()
+
+    run = load_run("runs/test1")  # {column: memory-mapped array}
+    plt.plot(run["timestamp"], run["measured_left"])
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+# (name, dtype) of the default columns, in log() argument order
+DEFAULT_COLUMNS = (
+    ("timestamp", "f8"),  # time.perf_counter()
+    ("commanded_left", "i4"),  # raw positions, -1 when missing
+    ("commanded_right", "i4"),
+    ("measured_left", "i4"),
+    ("measured_right", "i4"),
+    ("latency", "f4"),  # seconds spent in the bus calls of this row
+    ("errors", "u1"),  # ERROR_* bit mask
+)
+ERROR_LEFT_WRITE = 1
+ERROR_RIGHT_WRITE = 2
+ERROR_LEFT_READ = 4
+ERROR_RIGHT_READ = 8
+
+MISSING = -1  # stored for None in integer columns
+METADATA_FILE = "metadata.json"
+
+
+class DataLogger:
+    def __init__(self, directory: str, columns=DEFAULT_COLUMNS, capacity: int = 65536, flush_interval: float = 0.2):
+        """
+        :param directory: Run directory, created if needed. Existing column files are overwritten.
+        :param columns: (name, NumPy dtype) of each column, in the order log() takes them.
+        :param capacity: Rows held in memory. Rows not flushed before being overwritten are counted in `dropped`,
+            so it should cover several flush intervals at the logging rate (65536 rows = 65 s at 1 kHz).
+        :param flush_interval: Seconds between background flushes.
+        """
+        self.directory = directory
+        self.columns = tuple((name, np.dtype(dtype)) for name, dtype in columns)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._buffers = [np.zeros(capacity, dtype=dtype) for _, dtype in self.columns]
+        self._integer = [dtype.kind in "iu" for _, dtype in self.columns]
+        self._head = 0  # rows logged, only written by log()
+        self._flushed = 0  # rows handed to the files, only written by the flush thread
+        self.dropped = 0
+        self._files = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_at = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._files = [open(os.path.join(self.directory, f"{name}.bin"), "wb") for name, _ in self.columns]
+        self._started_at = time.time()
+        self._write_metadata()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def log(self, *values):
+        """Append one row, one value per column. None in an integer column is stored as MISSING."""
+        index = self._head % self.capacity
+        for buffer, integer, value in zip(self._buffers, self._integer, values):
+            buffer[index] = MISSING if value is None and integer else value
+        # Publish the row only after all its columns are written
+        self._head += 1
+
+    def close(self):
+        """Flush everything logged so far and finish the run's metadata."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._flush()
+        for file in self._files:
+            file.close()
+        self._files = None
+        self._write_metadata()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+
+    def _flush(self):
+        head = self._head
+        start = self._flushed
+        if head - start > self.capacity:
+            self.dropped += head - start - self.capacity
+            start = head - self.capacity
+        count = head - start
+        if count == 0:
+            return
+        first_index = start % self.capacity
+        first = min(count, self.capacity - first_index)
+        for buffer, file in zip(self._buffers, self._files):
+            file.write(buffer[first_index:first_index + first].tobytes())
+            if count > first:  # wrapped around the end of the ring
+                file.write(buffer[:count - first].tobytes())
+            file.flush()
+        self._flushed = head
+
+    def _write_metadata(self):
+        metadata = {
+            "columns": [[name, dtype.str] for name, dtype in self.columns],
+            "rows": self._flushed - self.dropped,
+            "dropped": self.dropped,
+            "started_at": self._started_at,
+            "missing": MISSING,
+        }
+        with open(os.path.join(self.directory, METADATA_FILE), "w") as file:
+            json.dump(metadata, file, indent=2)
+
+
+def load_run(directory: str, mmap: bool = True) -> dict:
+    """Map a run written by DataLogger back into arrays.
+    Rows are counted from the file sizes, so runs that were not closed cleanly load as well.
+    :param mmap: Memory-map the column files instead of reading them into memory.
+    :return: {column name: array}, all of the same length.
+    """
+    with open(os.path.join(directory, METADATA_FILE)) as file:
+        metadata = json.load(file)
+    columns = [(name, np.dtype(dtype)) for name, dtype in metadata["columns"]]
+    paths = {name: os.path.join(directory, f"{name}.bin") for name, _ in columns}
+    rows = min(os.path.getsize(paths[name]) // dtype.itemsize for name, dtype in columns)
+    run = {}
+    for name, dtype in columns:
+        if rows == 0:
+            run[name] = np.zeros(0, dtype=dtype)
+        elif mmap:
+            run[name] = np.memmap(paths[name], dtype=dtype, mode="r", shape=(rows,))
+        else:
+            run[name] = np.fromfile(paths[name], dtype=dtype, count=rows)
+    return run
@@ -1,13 +1,20 @@
-from pymodbus.client import ModbusSerialClient
-from pymodbus.payload import BinaryPayloadDecoder
-from pymodbus.constants import Endian
+import weakref
+
+from calibration import GripperCalibration
+from connection_pool import SHARED_POOL, ConnectionPool
 
 class GripperControl:
-    def __init__(self, port: str, baudrate: int = 115200, raw_max_position: int = 100, raw_min_position: int = 580):
+    def __init__(self, port: str, baudrate: int = 115200, raw_max_position: int = 100, raw_min_position: int = 580,
+                 calibration: GripperCalibration = None,
+                 pool: ConnectionPool = SHARED_POOL):
         """
         Initialize the GripperControl class.
+        The serial port is shared with every other GripperControl on the same (port, baudrate) and opened on first use.
         :param port: Serial port (e.g., 'COM9').
         :param baudrate: Baud rate (default is 115200).
+        :param calibration: Percent to raw mapping (default linear raw_min_position to raw_max_position).
+            Unlike the one_init module, 0% is raw 580 and 100% raw 100 by default (decreasing table).
+        :param pool: Connection pool the port is taken from.
         """
         self.port = port
         self.baudrate = baudrate
@@ -17,6 +24,12 @@ class GripperControl:
         self.speed_register_address = 3
         self.RAW_MAX_POSITION = raw_max_position # full open
         self.RAW_MIN_POSITION = raw_min_position # full close
+        if calibration is None:
+            calibration = GripperCalibration.linear(raw_at_0=raw_min_position, raw_at_100=raw_max_position)
+        self.calibration = calibration
+        self._connection = pool.acquire(port, baudrate, timeout=1)
+        # Release the reference when the object is closed or garbage collected, whichever comes first
+        self._release = weakref.finalize(self, pool.release, self._connection)
         print(f"GripperControl initialized using port and baudrate: {port}, {baudrate}")
 
     def _send_modbus_command(self, address: int, register_address: int, value: int) -> bool:
@@ -25,41 +38,45 @@ class GripperControl:
         """
         flag = False  # Initialize flag as False
         
-        client = ModbusSerialClient(port=self.port, baudrate=self.baudrate, timeout=1)
-        if client.connect():
-            try:
+        try:
+            with self._connection.client() as client:
                 response = client.write_register(register_address, value, slave=address)
-                if response.isError():
-                    print(f"Error: {response.message}")
-                else:
-                    flag = True
-                    
-            except Exception as e:
-                print(f"An error occurred while sending command: {e}")
-            finally:
-                client.close()
-        else:
+            if response.isError():
+                print(f"Error: {response.message}")
+            else:
+                flag = True
+
+        except ConnectionError:
             print("Failed to connect to the Modbus device.")
+        except Exception as e:
+            print(f"An error occurred while sending command: {e}")
         
         return flag
 
     def _read_modbus_register(self, address: int, register_address: int, num_registers: int):
         """Read a Modbus register value from the device."""
-        client = ModbusSerialClient(port=self.port, baudrate=self.baudrate, timeout=5)
-        if client.connect():
-            try:
-                response = client.read_holding_registers(register_address, num_registers, slave=address)
-                if response.isError():
-                    print(f"Read Error: {response}")
-                    return []
-                else:
-                    decoder = BinaryPayloadDecoder.fromRegisters(response.registers, byteorder=Endian.BIG)
-                    return [decoder.decode_16bit_uint() for _ in range(num_registers)]
-            finally:
-                client.close()
-        else:
+        try:
+            with self._connection.client() as client:
+                response = client.read_holding_registers(register_address, count=num_registers, slave=address)
+        except ConnectionError:
             print("Failed to connect to the Modbus device.")
             return []
+        if response.isError():
+            print(f"Read Error: {response}")
+            return []
+        else:
+            # Holding registers are unsigned 16 bit already
+            return list(response.registers)
+
+    def close(self):
+        """Release this object's reference to the shared port (closed when no GripperControl uses it anymore)."""
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def read_position(self, read_num_registers: int = 1):
         """Read the current position of both left and right grippers."""
@@ -84,14 +101,15 @@ class GripperControl:
                 print(f"Right gripper speed setting successful: {speed}")
     
     def map_position(self, percent_position: float):
-        """Map the percent position to raw position. 0% to self.RAW_MIN_POSITION, 100% to self.RAW_MAX_POSITION."""
-        return int(self.RAW_MIN_POSITION + (self.RAW_MAX_POSITION - self.RAW_MIN_POSITION) * percent_position / 100)
+        """Map the percent position to raw position. By default 0% to self.RAW_MIN_POSITION, 100% to self.RAW_MAX_POSITION."""
+        return self.calibration.to_raw(percent_position)
 
         
     def set_position_raw(self, close_position: float):
         """Close the grippers to a specified position."""
-        if not self.RAW_MAX_POSITION <= close_position <= self.RAW_MIN_POSITION:
-            print("Invalid position value. Position should be between 100 and 560.")
+        low, high = self.calibration.raw_range
+        if not low <= close_position <= high:
+            print(f"Invalid position value. Position should be between {low:g} and {high:g}.")
             return
         write_left_flag = self._send_modbus_command(self.left_address, self.pos_register_address, int(close_position))
         write_right_flag = self._send_modbus_command(self.right_address, self.pos_register_address, int(close_position))
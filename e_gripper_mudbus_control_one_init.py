@@ -1,151 +1,715 @@
-from pymodbus.client import ModbusSerialClient, AsyncModbusSerialClient
-from pymodbus.payload import BinaryPayloadDecoder
-from pymodbus.exceptions import ModbusException
-from pymodbus.constants import Endian
+# pymodbus (and asyncio, which it pulls in) is imported when the first client is created,
+# so scripts that only map positions or print help start fast
+from collections import deque
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+import threading
 import time
 
+from adaptive_timeout import AdaptiveTimeout, calibrate_timeouts
+from calibration import GripperCalibration
+from command_queue import CoalescingCommandQueue
+from connection_health import ConnectionMonitor
+from modbus_rtu import BROADCAST_ADDRESS, SingleRegisterFrames, build_write_register_frame
+from register_map import (
+    BLOCK_READ_MAX_COUNT,
+    BLOCK_READ_MAX_GAP,
+    GRIPPER_REGISTERS,
+    GripperRegisters,
+    plan_block_reads,
+)
+from retry_policy import RetryPolicy, RetryStats, rtu_silent_interval
+from telemetry import Telemetry
 
-class GripperControl:
-    def __init__(self, port: str, baudrate: int = 115200, raw_max_position: int = 580, raw_min_position: int = 100):
-        """
-        Initialize the GripperControl class.
-        :param port: Serial port (e.g., 'COM9').
-        :param baudrate: Baud rate (default is 115200).
-        """
+
+# "sequential": left then right through pymodbus, "broadcast": one frame to slave 0,
+# "pipelined": both frames sent back to back before collecting the responses
+SYNC_MODES = ("sequential", "broadcast", "pipelined")
+# read_PID/set_PID key -> register name
+PID_REGISTER_NAMES = {"P": "pid_p", "I": "pid_i", "D": "pid_d"}
+
+
+def _failure_outcome(error: Exception) -> str:
+    """Telemetry outcome of a request that raised: pymodbus reports missing or unusable responses as ModbusIOException."""
+    from pymodbus.exceptions import ModbusIOException
+
+    message = str(error).lower()
+    if "crc" in message:
+        return "crc"
+    if isinstance(error, ModbusIOException) or "no response" in message or "timeout" in message:
+        return "timeout"
+    return "error"
+
+
+def _watch_framer(framer):
+    """Make a pymodbus RTU framer count the frames it builds in framer.frames_sent (more than one per request
+    are retransmissions) and set framer.crc_failed when it drops a complete response for a bad CRC.
+    pymodbus discards such a frame silently and keeps waiting, so the request would only end as unanswered.
+    """
+    decode = framer.decode
+    build_frame = framer.buildFrame
+
+    def checked_decode(data):
+        result = decode(data)
+        if not result[0] and not framer.crc_failed and len(data) >= framer.MIN_SIZE:
+            pdu_class = framer.decoder.lookupPduClass(data)
+            size = pdu_class.calculateRtuFrameSize(data) if pdu_class else 0
+            framer.crc_failed = bool(size) and len(data) >= size
+        return result
+
+    def counted_build_frame(message):
+        framer.frames_sent += 1
+        return build_frame(message)
+
+    framer.crc_failed = False
+    framer.frames_sent = 0
+    framer.decode = checked_decode
+    framer.buildFrame = counted_build_frame
+    return framer
+
+
+class GripperInfo(NamedTuple):
+    """Snapshot of the configuration registers of one gripper. None marks a failed read.
+    Field names are register names of GRIPPER_REGISTERS.
+    """
+    position: Optional[int]
+    speed: Optional[int]
+    loop_mode: Optional[int]
+    target_writeback: Optional[int]
+    polarity: Optional[int]
+    target_lock: Optional[int]
+    pid_p: Optional[int]
+    pid_i: Optional[int]
+    pid_d: Optional[int]
+    deadzone: Optional[int]
+    max_torque: Optional[int]
+
+
+class PositionSample(NamedTuple):
+    """Positions of both grippers read at `timestamp` (time.perf_counter())."""
+    timestamp: float
+    left: int
+    right: int
+
+
+# move_to outcomes
+MOVE_REACHED = "reached"  # both grippers within tolerance of the target
+MOVE_STALLED = "stalled"  # motion stopped short of the target, e.g. on a grasped object
+MOVE_TIMEOUT = "timeout"
+MOVE_FAILED = "failed"  # the position write was not acknowledged, nothing was polled
+
+
+class MoveResult(NamedTuple):
+    status: str  # MOVE_REACHED, MOVE_STALLED, MOVE_TIMEOUT or MOVE_FAILED
+    settle_time: float  # seconds from the command until the status was decided
+    left: Optional[int]  # last measured raw positions
+    right: Optional[int]
+    polls: int  # position reads
+
+    @property
+    def reached(self) -> bool:
+        return self.status == MOVE_REACHED
+
+
+class _MoveTracker:
+    """Convergence and stall detection of one move_to, shared by the sync and async versions.
+    The next poll is scheduled at half the remaining distance over the observed speed, so a long move is
+    polled slowly and the end of a move quickly.
+    """
+
+    def __init__(self, gripper, percent: float, tolerance: float, stall_time: float, stall_distance: float,
+                 min_interval: float, max_interval: float):
+        self.start = time.perf_counter()
+        self.percent = percent
+        self.tolerance = tolerance
+        self.stall_time = stall_time
+        self.stall_distance = stall_distance
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.calibrations = (gripper.left_calibration, gripper.right_calibration)
+        self.history = deque()  # (time, (left percent, right percent)) of the last stall_time
+        self.interval = min_interval
+        self.polls = 0
+
+    def update(self, left, right):
+        """Add a position sample. :return: A MOVE_* status once decided, else None."""
+        now = time.perf_counter()
+        self.polls += 1
+        if left is None or right is None:
+            self.interval = self.min_interval
+            return None
+        percents = (self.calibrations[0].to_percent(left), self.calibrations[1].to_percent(right))
+        errors = [abs(percent - self.percent) for percent in percents]
+        if max(errors) <= self.tolerance:
+            return MOVE_REACHED
+
+        history = self.history
+        history.append((now, percents))
+        while len(history) > 2 and now - history[1][0] >= self.stall_time:
+            history.popleft()
+        then, old_percents = history[0]
+        elapsed = now - then
+        speed = 0.0
+        if elapsed >= self.stall_time:
+            moved = [abs(a - b) for a, b in zip(percents, old_percents)]
+            # Each side is either there or no longer moving
+            if all(error <= self.tolerance or distance < self.stall_distance for error, distance in zip(errors, moved)):
+                return MOVE_STALLED
+            speed = max(moved) / elapsed
+        interval = max(errors) / speed / 2 if speed > 0 else self.min_interval
+        self.interval = min(self.max_interval, max(self.min_interval, interval))
+        return None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def result(self, status: str, left, right) -> MoveResult:
+        return MoveResult(status, self.elapsed(), left, right, self.polls)
+
+
+class _GripperBase:
+    """Settings, register map and position mapping shared by the sync and async gripper controls."""
+
+    register_map = GRIPPER_REGISTERS
+
+    def _init_settings(self, port: str, baudrate: int, raw_max_position: int, raw_min_position: int,
+                       left_calibration: GripperCalibration = None, right_calibration: GripperCalibration = None):
         self.init_consts()
         self.port = port
         self.baudrate = baudrate
-        self.left_address = 2  # Device address for left gripper
-        self.right_address = 10  # Device address for right gripper
-        self.pos_register_address = 2  # Position register address
-        self.speed_register_address = 3  
-        self.pos_pos_lock_register = 8
+        self.left_address = self.LEFT_ADDRESS  # Device address for left gripper
+        self.right_address = self.RIGHT_ADDRESS  # Device address for right gripper
+        self.pos_register_address = self.POS_REGISTER_ADDRESS
+        self.speed_register_address = self.SPEED_REGISTER_ADDRESS
+        # Typed register accessors, e.g. self.left.set_speed(800)
+        self.left = GripperRegisters(self, self.left_address)
+        self.right = GripperRegisters(self, self.right_address)
         self.RAW_MAX_POSITION = raw_max_position # full open
         self.RAW_MIN_POSITION = raw_min_position # full close
-        self.PID_P_address = 9
-        self.PID_I_address = 10
-        self.PID_D_address = 11
+        default_calibration = GripperCalibration.linear(raw_at_0=raw_min_position, raw_at_100=raw_max_position)
+        self.left_calibration = left_calibration if left_calibration is not None else default_calibration
+        self.right_calibration = right_calibration if right_calibration is not None else default_calibration
+        self.interframe_delay = rtu_silent_interval(baudrate)  # Modbus RTU 3.5 character silent interval
+        self._last_frame_time = 0.0
 
-        self.client = ModbusSerialClient(port=self.port, baudrate=self.baudrate, timeout=0.005)
-        if not self.client.connect():
-            raise Exception("Failed to connect to the Modbus device.")
-        print(f"GripperControl Synchronous initialized using port and baudrate: {port}, {baudrate}")
+    def _interframe_wait_time(self) -> float:
+        """Time left until the bus has been silent for the inter-frame interval."""
+        return self._last_frame_time + self.interframe_delay - time.perf_counter()
+
+    def _mark_frame_end(self):
+        self._last_frame_time = time.perf_counter()
+
+    @staticmethod
+    def _crc_checked(framer, error: Exception) -> Exception:
+        """error, or a CRC error if the framer dropped a response with a bad CRC during the request."""
+        if not framer.crc_failed:
+            return error
+        from pymodbus.exceptions import ModbusIOException
+
+        return ModbusIOException(f"Response failed the CRC check ({error})")
 
+    def _record(self, operation: str, slave: int, start: float, outcome: str):
+        """Count one request in self.telemetry. Callers check `self.telemetry is not None` first."""
+        self.telemetry.record(operation, slave, time.perf_counter() - start, outcome)
 
     def init_consts(self):
-        # 00002 Position 
-        # 00003 最高速度-Maxspeed 1000 #200-1023 
-        # 00004 循环模式-LoopMode 0 
-        # 00006 目标回写-TargetWriteback 1
-        # 00007 极性-Polarity    0
-        # 00008 目标锁定-TargetLock 1
-        # 00009 PID_P  50
-        # 00010 PID_I  5
-        # 00010 PID_D  0
-        # 00014 死区-Deadzone   15
-        # 00015 最大扭矩-MaxTrque 800
+        # Register addresses come from the declarative table in register_map.py
         self.LEFT_ADDRESS = 2  # Device address for left gripper
         self.RIGHT_ADDRESS = 10  # Device address for right gripper
-        self.POS_REGISTER_ADDRESS = 2  # Position register address
-        self.SPEED_REGISTER_ADDRESS = 3  # Speed register address
-        self.LOOP_MODE_REGISTER_ADDRESS = 4  # Loop mode register address
-        self.TARGET_WRITEBACK_REGISTER_ADDRESS = 6  # Target writeback register address
-        self.POLARITY_REGISTER_ADDRESS = 7  # Polarity register address
-        self.TARGET_LOCK_REGISTER_ADDRESS = 8  # Target lock register address
-        self.PID_P_REGISTER_ADDRESS = 9  # PID P register address
-        self.PID_I_REGISTER_ADDRESS = 10  # PID I register address
-        self.PID_D_REGISTER_ADDRESS = 11  # PID D register address
-        self.DEADZONE_REGISTER_ADDRESS = 14  # Deadzone register address
-        self.MAX_TORQUE_REGISTER_ADDRESS = 15  # Max torque register address
+        registers = self.register_map
+        self.POS_REGISTER_ADDRESS = registers["position"].address  # Position register address
+        self.SPEED_REGISTER_ADDRESS = registers["speed"].address  # Speed register address
+        self.LOOP_MODE_REGISTER_ADDRESS = registers["loop_mode"].address  # Loop mode register address
+        self.TARGET_WRITEBACK_REGISTER_ADDRESS = registers["target_writeback"].address  # Target writeback register address
+        self.POLARITY_REGISTER_ADDRESS = registers["polarity"].address  # Polarity register address
+        self.TARGET_LOCK_REGISTER_ADDRESS = registers["target_lock"].address  # Target lock register address
+        self.PID_P_REGISTER_ADDRESS = registers["pid_p"].address  # PID P register address
+        self.PID_I_REGISTER_ADDRESS = registers["pid_i"].address  # PID I register address
+        self.PID_D_REGISTER_ADDRESS = registers["pid_d"].address  # PID D register address
+        self.DEADZONE_REGISTER_ADDRESS = registers["deadzone"].address  # Deadzone register address
+        self.MAX_TORQUE_REGISTER_ADDRESS = registers["max_torque"].address  # Max torque register address
+        # Register of every GripperInfo field, in field order
+        self.INFO_REGISTER_ADDRESSES = registers.addresses(GripperInfo._fields)
+        self.INFO_READ_PLAN = registers.read_plan(GripperInfo._fields)
+
+    def map_position(self, percent_position: float):
+        """Map the percent position to raw position with the left calibration.
+        By default 0% to self.RAW_MIN_POSITION, 100% to self.RAW_MAX_POSITION.
+        Arrays are mapped in one vectorized call.
+        """
+        return self.left_calibration.to_raw(percent_position)
+
+    def map_positions(self, percent_position: float):
+        """Map the percent position to (left_raw, right_raw) with each gripper's calibration."""
+        return self.left_calibration.to_raw(percent_position), self.right_calibration.to_raw(percent_position)
+
+
+    def _print_info(self, side_address, info: GripperInfo):
+        print(f"-------- Side {side_address} --------")
+        print(f"Position: {info.position}")
+        print(f"Speed: {info.speed}")
+        print(f"Loop Mode: {info.loop_mode}")
+        print(f"Target Writeback: {info.target_writeback}")
+        print(f"Polarity: {info.polarity}")
+        print(f"Target Lock: {info.target_lock}")
+        print(f"PID P: {info.pid_p}")
+        print(f"PID I: {info.pid_i}")
+        print(f"PID D: {info.pid_d}")
+        print(f"Deadzone: {info.deadzone}")
+        print(f"Max Torque: {info.max_torque}")
+        print("-------------------------------")
+
+
+class GripperControl(_GripperBase):
+    POLLER_STALE_PERIODS = 3  # default max_staleness of read_position, in poll periods
+
+    def __init__(self, port: str, baudrate: int = 115200, raw_max_position: int = 580, raw_min_position: int = 100,
+                 retry_policy: RetryPolicy = None, sync_mode: str = "sequential", timeout: float = 0.005,
+                 left_calibration: GripperCalibration = None, right_calibration: GripperCalibration = None,
+                 shadow_registers: bool = True, position_deadband: int = 0, telemetry: Telemetry = None,
+                 verbose: bool = False, timeout_estimator: AdaptiveTimeout = None, lazy: bool = True,
+                 fast_path: bool = False, capture=None, transport=None, modbus_retries: int = 3):
+        """
+        Initialize the GripperControl class.
+        :param port: Serial port (e.g., 'COM9').
+        :param baudrate: Baud rate (default is 115200).
+        :param timeout: Response timeout in seconds (see the README on why 0.005).
+        :param retry_policy: Retry policy of set_position_raw (default RetryPolicy()). Its attempts are sent
+            without pymodbus retransmissions, so the policy is the only retry layer for them.
+        :param sync_mode: How set_position_raw_direct writes both grippers, one of SYNC_MODES.
+        :param left_calibration: Percent to raw mapping of the left gripper (default linear RAW_MIN to RAW_MAX).
+        :param right_calibration: Percent to raw mapping of the right gripper (default linear RAW_MIN to RAW_MAX).
+        :param shadow_registers: Skip writes of values the device already holds, per the last successful writes.
+        :param position_deadband: Skip position writes within this many raw units of the last written target.
+        :param telemetry: Telemetry that counts every request and its latency (None records nothing).
+        :param verbose: Print the result of every command, as earlier versions did.
+        :param timeout_estimator: Derive each request's timeout from the measured RTT of its slave instead of
+            using the fixed timeout, see calibrate_timeouts().
+        :param lazy: Open the port on the first bus access instead of here. A port that can't be opened then
+            fails that access (writes return False, reads raise); call connect() to check it up front.
+        :param fast_path: Write and read the position register with prebuilt RTU frames straight on the serial
+            port instead of through pymodbus (no pymodbus retries; see benchmark_fast_path.py).
+        :param capture: bus_capture.BusCapture that records every frame sent and received.
+        :param transport: Open pyserial compatible port to talk through instead of opening `port`,
+            e.g. a bus_capture.ReplaySerial.
+        :param modbus_retries: Retransmissions inside pymodbus of the requests retry_policy does not cover
+            (reads, set_position_raw_direct/percent, the other setters).
+        """
+        if sync_mode not in SYNC_MODES:
+            raise ValueError(f"sync_mode must be one of {SYNC_MODES}")
+        self._init_settings(port, baudrate, raw_max_position, raw_min_position, left_calibration, right_calibration)
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.write_stats = RetryStats()
+        self.modbus_retries = modbus_retries
+        self._bus_lock = threading.RLock()
+        self._position_sample = None
+        self._poller_thread = None
+        self._poller_period = None
+        self._poller_stop = threading.Event()
+        self.sync_mode = sync_mode
+        self.last_command_skew = None
+        self._skews = deque(maxlen=1000)
+        self.command_queue = None
+        self.shadow_registers = shadow_registers
+        self.position_deadband = position_deadband
+        self.skipped_writes = 0
+        self._shadow = {}  # slave address -> {register address: last value written or read}
+        self.telemetry = telemetry
+        self.verbose = verbose
+        self.link_monitor = None
+        self._link_failures = 0  # consecutive bus transactions that raised
+        self._last_ok_time = time.perf_counter()
+        self.timeout_estimator = timeout_estimator
+        self._current_timeout = timeout
+        self._client = None
+        self.capture = capture
+        self.transport = transport
+        self._fast_frames = None
+        if fast_path:
+            self._fast_frames = SingleRegisterFrames(self.pos_register_address, (self.left_address, self.right_address))
+        if not lazy:
+            self.connect()
+        if self.verbose:
+            print(f"GripperControl Synchronous initialized using port and baudrate: {port}, {baudrate}")
+
+    @property
+    def client(self):
+        """The ModbusSerialClient, created and connected on first use."""
+        client = self._client
+        if client is None:
+            client = self.connect()
+        if self.capture is not None:
+            self.capture.attach(client)  # again after every reopen of the port
+        return client
+
+    def connect(self):
+        """Open the port now (it is otherwise opened on the first bus access). :return: The ModbusSerialClient."""
+        with self._bus_lock:
+            if self._client is None:
+                from pymodbus.client import ModbusSerialClient
+
+                # Attempts of retry_policy turn the retransmissions off (_send_modbus_command(retransmit=False)),
+                # and _bus_transaction does not time requests that were retransmitted (Karn's rule)
+                client = ModbusSerialClient(port=self.port, baudrate=self.baudrate, timeout=self._current_timeout,
+                                            retries=self.modbus_retries)
+                _watch_framer(client.framer)
+                if self.transport is not None:
+                    self.transport.timeout = self._current_timeout
+                    client.socket = self.transport
+                if not client.connect():
+                    raise Exception("Failed to connect to the Modbus device.")
+                self._client = client
+                self.invalidate_shadow()  # the grippers may have been reset while the port was closed
+            return self._client
 
 
     def close(self):
         """
         关闭 Modbus 客户端连接。
         """
-        if self.client:
-            self.client.close()
-            print("Modbus client connection closed.")
+        self.stop_link_monitor()
+        self.stop_command_queue()
+        self.stop_position_poller()
+        self.invalidate_shadow()
+        if self._client:
+            self._client.close()
+            self._client = None
+            if self.verbose:
+                print("Modbus client connection closed.")
 
-    def _send_modbus_command(self, address: int, register_address: int, value: float) -> bool:
+    def _send_modbus_command(self, address: int, register_address: int, value: float, force: bool = False,
+                             retransmit: bool = True) -> bool:
         """Send a Modbus RTU command to the device.
-        :return: True if the command was successful, False otherwise.
+        Writes of the value the shadow registers already hold are skipped unless force is True.
+        retransmit=False sends the request once, for callers that retry themselves.
+        :return: True if the command was successful (or skipped), False otherwise.
         """
+        if not force and self._shadow_matches(address, register_address, value):
+            self.skipped_writes += 1
+            return True
+        if self._fast_frames is not None and register_address == self.pos_register_address:
+            return self._write_position_fast(address, int(value))
         flag = False  # Initialize flag as False
-               
+        outcome = "ok"
+        start = time.perf_counter() if self.telemetry is not None else 0.0
         try:
-            response = self.client.write_register(register_address, value, slave=address)
+            with self._bus_transaction(address):
+                transaction = self.client.transaction
+                transaction.retries = self.modbus_retries if retransmit else 0
+                try:
+                    response = self.client.write_register(register_address, value, slave=address)
+                finally:
+                    transaction.retries = self.modbus_retries
             if response.isError():
-               print(f"Error: {response.message}")
-            if response:
+                outcome = "error"
+                if self.verbose:
+                    print(f"Error: {response.message}")
+            else:
                 flag = True
-            time.sleep(0.001)  # 1 毫秒延迟
-                
-                
                 
-        except ModbusException as e:
-            print(f"ModbusException occurred while sending command: {e}")
-            return False
-    
         except Exception as e:
-            # print(f"An unexpected error occurred while sending command: {e}")
+            outcome = _failure_outcome(e)
+            if self.verbose:
+                print(f"An error occurred while sending command: {e}")
+            flag = False
+
+        if self.telemetry is not None:
+            self._record("write", address, start, outcome)
+        self._update_shadow(address, register_address, value, flag)
+        return flag
+
+    def seed_shadow_registers(self):
+        """Fill the shadow registers of both grippers from one block read each.
+        The position register is not seeded: reading it returns the measured position, not the last target.
+        """
+        for address in (self.left_address, self.right_address):
+            values = self.read_registers(address, self.INFO_REGISTER_ADDRESSES, read_plan=self.INFO_READ_PLAN)
+            self._shadow[address] = {
+                register: value for register, value in values.items()
+                if value is not None and register != self.pos_register_address
+            }
+
+    def invalidate_shadow(self, address: int = None):
+        """Forget the shadow registers of one slave (default all), e.g. after an error or a reconnect."""
+        if address is None:
+            self._shadow.clear()
+        else:
+            self._shadow.pop(address, None)
+
+    def _shadow_matches(self, address: int, register_address: int, value: float) -> bool:
+        if not self.shadow_registers:
             return False
-        
-           
+        shadow = self._shadow.get(address, {}).get(register_address)
+        if shadow is None:
+            return False
+        if register_address == self.pos_register_address:
+            return abs(int(value) - shadow) <= self.position_deadband
+        return int(value) == shadow
+
+    def _update_shadow(self, address: int, register_address: int, value: float, success: bool):
+        if success:
+            self._shadow.setdefault(address, {})[register_address] = int(value)
+        else:
+            self.invalidate_shadow(address)
+
+    @contextmanager
+    def _bus_transaction(self, slave: int = None):
+        """Hold the bus for one request/response and keep the RTU silent interval between frames.
+        Only the remainder of the interval since the last frame is slept.
+        Transactions that raise (no response, serial errors) count as link failures for the link monitor and
+        drop the shadow registers of the slave (of all slaves for broadcasts): it may have power-cycled.
+        A request that went unanswered because pymodbus dropped a response with a bad CRC raises a CRC error.
+        Requests pymodbus retransmitted are not timed: their RTT is ambiguous (Karn's rule), the estimator backs off.
+        :param slave: Addressed slave; with a timeout estimator its timeout is applied and its RTT measured.
+        """
+        with self._bus_lock:
+            wait_time = self._interframe_wait_time()
+            if wait_time > 0:
+                time.sleep(wait_time)
+            estimator = self.timeout_estimator if slave is not None else None
+            if estimator is not None:
+                self._set_timeout(estimator.timeout(slave))
+                start = time.perf_counter()
+            if self._client is not None:
+                self._client.framer.crc_failed = False
+                self._client.framer.frames_sent = 0
+            try:
+                yield
+            except Exception as e:
+                self._link_failures += 1
+                self.invalidate_shadow(slave)
+                if estimator is not None:
+                    estimator.timed_out(slave)
+                error = self._crc_checked(self._client.framer, e) if self._client is not None else e
+                if error is not e:
+                    raise error from e
+                raise
+            else:
+                self._link_failures = 0
+                self._last_ok_time = time.perf_counter()
+                if estimator is not None:
+                    if self._client is not None and self._client.framer.frames_sent > 1:
+                        estimator.timed_out(slave)  # the first attempt went unanswered
+                    else:
+                        estimator.observe(slave, self._last_ok_time - start)
+            finally:
+                self._mark_frame_end()
+
+    def _set_timeout(self, timeout: float):
+        """Change the response timeout of the client (pymodbus waits on comm_params, pyserial on the port)."""
+        if timeout == self._current_timeout:
+            return
+        self._current_timeout = timeout
+        self.client.comm_params.timeout_connect = timeout
+        if self.client.socket is not None:
+            self.client.socket.timeout = timeout
+
+    def calibrate_timeouts(self, samples: int = 20) -> dict:
+        """Probe both grippers to seed the timeout estimator (an AdaptiveTimeout is attached if there is none).
+        :return: {slave: timeout in seconds}
+        """
+        if self.timeout_estimator is None:
+            self.timeout_estimator = AdaptiveTimeout(initial=self._current_timeout)
+        return calibrate_timeouts(self, samples)
+
+    def start_link_monitor(self, **kwargs) -> ConnectionMonitor:
+        """Watch the link with heartbeats and reopen the port after a failure, see ConnectionMonitor for kwargs."""
+        if self.link_monitor is None:
+            self.link_monitor = ConnectionMonitor(self, **kwargs)
+            self.link_monitor.start()
+        return self.link_monitor
+
+    def stop_link_monitor(self):
+        if self.link_monitor is not None:
+            self.link_monitor.stop()
+            self.link_monitor = None
+
+    def _send_modbus_command_with_retry(self, address: int, register_address: int, value: float) -> bool:
+        """Send a command, retrying according to self.retry_policy. Attempts and latency go to self.write_stats."""
+        flag, _attempts = self.retry_policy.run(
+            lambda: self._send_modbus_command(address, register_address, value, retransmit=False),
+            stats=self.write_stats
+        )
         return flag
 
     def _read_modbus_register(self, id_address: int, register_address: int, num_registers: int):
         """Read a Modbus register value from the device."""
         
+        if self._fast_frames is not None and register_address == self.pos_register_address and num_registers == 1:
+            return self._read_position_fast(id_address)
         # try:
         # response = self.client.read_holding_registers(register_address, num_registers, slave=id_address)
-        response = self.client.read_holding_registers(register_address, count=num_registers, slave=id_address)
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            with self._bus_transaction(id_address):
+                response = self.client.read_holding_registers(register_address, count=num_registers, slave=id_address)
+        except Exception as e:
+            if self.telemetry is not None:
+                self._record("read", id_address, start, _failure_outcome(e))
+            raise
         if response.isError():
-            print(f"Read Error: {response}")
+            if self.telemetry is not None:
+                self._record("read", id_address, start, "error")
+            if self.verbose:
+                print(f"Read Error: {response}")
             return None
+        if self.telemetry is not None:
+            self._record("read", id_address, start, "ok")
         
-        # depericated
-        # decoder = BinaryPayloadDecoder.fromRegisters(response.registers, byteorder=Endian.BIG)
-        # value = decoder.decode_16bit_uint()
-
-        value = self.client.convert_from_registers(response.registers, ModbusSerialClient.DATATYPE.UINT16)
-        # value = self.client.convert_from_registers(response.registers, ModbusSerialClient.DATATYPE.UINT16, byteorder='big')
+        value = self.client.convert_from_registers(response.registers, self.client.DATATYPE.UINT16)
 
         # except Exception as e:
         #     print(f"An error occurred while reading register: {e}")
         #     return None
 
         return value
+
+    def _read_register_block(self, id_address: int, start_address: int, count: int):
+        """Read `count` consecutive holding registers in one request.
+        :return: List of register values, or None if the device rejected the request. Raises if it did not answer.
+        """
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            with self._bus_transaction(id_address):
+                response = self.client.read_holding_registers(start_address, count=count, slave=id_address)
+        except Exception as e:
+            if self.telemetry is not None:
+                self._record("read_block", id_address, start, _failure_outcome(e))
+            raise
+        if self.telemetry is not None:
+            self._record("read_block", id_address, start, "error" if response.isError() else "ok")
+        if response.isError():
+            return None
+        return list(response.registers)
+
+    def read_registers(self, id_address: int, register_addresses, read_plan=None, max_gap: int = BLOCK_READ_MAX_GAP):
+        """Read a set of registers with the minimum number of block reads.
+        Blocks the device rejects (e.g. because they span unmapped registers) are re-read register by register.
+        If the device does not answer, the remaining reads are skipped, as they would only time out as well.
+        :param read_plan: Precomputed plan_block_reads() result for register_addresses.
+        :return: Dict mapping register address to value (None if it could not be read). Never raises for bus errors.
+        """
+        wanted = set(register_addresses)
+        values = dict.fromkeys(wanted)
+        if read_plan is None:
+            read_plan = plan_block_reads(wanted, max_gap=max_gap)
+        for start, count in read_plan:
+            try:
+                registers = self._read_register_block(id_address, start, count)
+                if registers is None and count > 1:
+                    registers = [
+                        self._read_modbus_register(id_address, start + i, 1) if start + i in wanted else None
+                        for i in range(count)
+                    ]
+            except Exception as e:
+                if self.verbose:
+                    print(f"An error occurred while reading registers: {e}")
+                break
+            for i in range(count):
+                if start + i in wanted:
+                    values[start + i] = registers[i] if registers is not None else None
+        return values
     
-    def read_position(self, read_num_registers: int = 1):
-        """Read the current position of both left and right grippers."""
+    def read_register(self, slave: int, name: str):
+        """Read one register of the register map by name. :return: Its value (None on a Modbus error)."""
+        register = self.register_map[name]
+        return register.decode(self._read_modbus_register(slave, register.address, 1))
+
+    def write_register(self, slave: int, name: str, value: int) -> bool:
+        """Write one register of the register map by name.
+        :raise ValueError: if the register is read-only or value is outside its range; nothing is sent then.
+        """
+        register = self.register_map[name]
+        return self._send_modbus_command(slave, register.address, register.validate(value))
+
+    def read_named_registers(self, slave: int, names=None) -> dict:
+        """Read registers of the register map (default all) with the precomputed block read plan.
+        :return: {name: value or None}
+        """
+        names = self.register_map.names() if names is None else tuple(names)
+        values = self.read_registers(slave, self.register_map.addresses(names), read_plan=self.register_map.read_plan(names))
+        return {name: self.register_map[name].decode(values.get(self.register_map[name].address)) for name in names}
+
+    def read_position(self, read_num_registers: int = 1, max_staleness: float = None):
+        """Read the current position of both left and right grippers.
+        While the position poller runs, the latest polled sample is returned without touching the bus.
+        :param max_staleness: Maximum age in seconds of a polled sample; older samples fall back to a bus read.
+            Default POLLER_STALE_PERIODS poll periods, so a dead link is not hidden behind the last good sample.
+        """
+        if self._poller_thread is not None and read_num_registers == 1:
+            sample = self._position_sample
+            if max_staleness is None:
+                max_staleness = self.POLLER_STALE_PERIODS * self._poller_period
+            if sample is not None and time.perf_counter() - sample.timestamp <= max_staleness:
+                return sample.left, sample.right
+        return self._read_position_from_bus(read_num_registers)
+
+    def read_position_sample(self):
+        """Latest PositionSample published by the position poller (None if it is not running or has no sample yet)."""
+        return self._position_sample
+
+    def start_position_poller(self, rate_hz: float = 100.0):
+        """Poll both grippers at a fixed rate on a background thread and cache the result for read_position()."""
+        if self._poller_thread is not None:
+            return
+        self._poller_stop.clear()
+        self._poller_period = 1.0 / rate_hz
+        self._poller_thread = threading.Thread(target=self._poll_positions, args=(1.0 / rate_hz,), daemon=True)
+        self._poller_thread.start()
+
+    def stop_position_poller(self):
+        if self._poller_thread is None:
+            return
+        self._poller_stop.set()
+        self._poller_thread.join()
+        self._poller_thread = None
+        self._position_sample = None
+
+    def _poll_positions(self, period: float):
+        next_time = time.perf_counter()
+        while not self._poller_stop.is_set():
+            left_position, right_position = self._read_position_from_bus()
+            if left_position is not None and right_position is not None:
+                # Publishing is a single reference assignment, so readers never need a lock
+                self._position_sample = PositionSample(time.perf_counter(), left_position, right_position)
+            next_time += period
+            wait_time = next_time - time.perf_counter()
+            if wait_time > 0:
+                self._poller_stop.wait(wait_time)
+            else:
+                next_time = time.perf_counter()  # overran the period, don't try to catch up
+
+    def _read_position_from_bus(self, read_num_registers: int = 1):
         try:
             left_position = self._read_modbus_register(self.left_address, self.pos_register_address, read_num_registers)
             right_position = self._read_modbus_register(self.right_address, self.pos_register_address, read_num_registers)
         except Exception as e:
-            print(f"An error occurred while reading position: {e}")
+            if self.verbose:
+                print(f"An error occurred while reading position: {e}")
             return None, None
 
         return left_position, right_position
 
     def set_pos_lock(self, loc_value: float):
-        """Read the current position of both left and right grippers."""
+        """Set the target lock register of both left and right grippers."""
         
-        left_pos_lock = self._send_modbus_command(self.left_address, self.pos_pos_lock_register, loc_value)
+        left_pos_lock = self._send_modbus_command(self.left_address, self.TARGET_LOCK_REGISTER_ADDRESS, loc_value)
 
-        right_pos_lock = self._send_modbus_command(self.left_address, self.pos_pos_lock_register, loc_value)
-        print("left_pos_lock", left_pos_lock)
-        print("right_pos_lock", right_pos_lock)
+        right_pos_lock = self._send_modbus_command(self.right_address, self.TARGET_LOCK_REGISTER_ADDRESS, loc_value)
+        if self.verbose:
+            print("left_pos_lock", left_pos_lock)
+            print("right_pos_lock", right_pos_lock)
         return left_pos_lock, right_pos_lock
 
     def read_pos_lock(self, read_num_registers: int = 1):
-        """Read the current position of both left and right grippers."""
+        """Read the target lock register of both left and right grippers."""
         
-        left_pos_lock = self._read_modbus_register(self.left_address, self.pos_pos_lock_register, read_num_registers)
+        left_pos_lock = self._read_modbus_register(self.left_address, self.TARGET_LOCK_REGISTER_ADDRESS, read_num_registers)
         
-        right_pos_lock = self._read_modbus_register(self.right_address, self.pos_pos_lock_register, read_num_registers)
-        print("left_pos_lock", left_pos_lock)
-        print("right_pos_lock", right_pos_lock)
+        right_pos_lock = self._read_modbus_register(self.right_address, self.TARGET_LOCK_REGISTER_ADDRESS, read_num_registers)
+        if self.verbose:
+            print("left_pos_lock", left_pos_lock)
+            print("right_pos_lock", right_pos_lock)
         return left_pos_lock, right_pos_lock
 
     def set_speed(self, speed: int):
@@ -154,161 +718,588 @@ class GripperControl:
         :param speed: Target speed value (range 200-1023).
         """
         # Check speed range
-        if speed < 200 or speed > 1023:
-            print("Error: Speed value must be between 200 and 1023.")
+        register = self.register_map["speed"]
+        if not register.minimum <= speed <= register.maximum:
+            print(f"Error: Speed value must be between {register.minimum} and {register.maximum}.")
             return
 
         left_speed = self._send_modbus_command(self.left_address, self.speed_register_address, speed)
         
         right_speed = self._send_modbus_command(self.right_address, self.speed_register_address, speed)
-        if left_speed and right_speed:
+        if self.verbose:
+            if left_speed and right_speed:
                 print(f"Right gripper speed setting successful: {speed}")
-        if left_speed:
-            print("left_speed")
-        if right_speed:
-            print("right_speed")
+            if left_speed:
+                print("left_speed")
+            if right_speed:
+                print("right_speed")
+        return left_speed, right_speed
 
     
-    def map_position(self, percent_position: float):
-        """Map the percent position to raw position. 0% to self.RAW_MIN_POSITION, 100% to self.RAW_MAX_POSITION."""
-        return int(self.RAW_MIN_POSITION + (self.RAW_MAX_POSITION - self.RAW_MIN_POSITION) * percent_position / 100)
-
-
     def set_position_raw(self, close_position: float):
         """Set the position raw value for left and right sides of the driver.
-        Retry writing to the right side if the left side is successful.
+        Each side is retried according to self.retry_policy (bounded attempts, backoff and deadline).
+        :return: (left_success, right_success)
         """
-        # Try writing to the left address first
-        write_left_flag = False
-        write_left_flag = self._send_modbus_command(self.left_address, self.pos_register_address, int(close_position))
-        
-        while not write_left_flag:
-            write_left_flag = self._send_modbus_command(self.left_address, self.pos_register_address, int(close_position))
-        
-        # If the left write was successful, start writing to the right
-        if write_left_flag:
-            print(f"Write to left side successful! Close position: {close_position}")
-        else:
-            print("set position wrong")
-            
-            # Keep retrying to write to the right side until it's successful
-        write_right_flag = False
-        while not write_right_flag:
-            write_right_flag = self._send_modbus_command(self.right_address, self.pos_register_address, int(close_position))
+        write_left_flag = self._send_modbus_command_with_retry(self.left_address, self.pos_register_address, int(close_position))
+        write_right_flag = self._send_modbus_command_with_retry(self.right_address, self.pos_register_address, int(close_position))
+        if self.verbose:
+            if write_left_flag:
+                print(f"Write to left side successful! Close position: {close_position}")
+            else:
+                print("Failed to write to left side, retry policy exhausted.")
             if write_right_flag:
                 print(f"Write to right side successful! Close position: {close_position}")
             else:
-                print("Retrying write to right side...")
-        # else:
-        #     print("Failed to write to left side. Retrying...")
-        #     # You can implement retry logic here if you want to keep retrying writing to left as well
+                print("Failed to write to right side, retry policy exhausted.")
+        return write_left_flag, write_right_flag
 
-    def set_position_raw_direct(self, close_position: float, verbose=False):
+    def get_write_stats(self) -> dict:
+        """Retry counts and latencies of the retried writes, for tuning self.retry_policy."""
+        return self.write_stats.summary()
+
+    def set_position_raw_direct(self, close_position: float, verbose=False, right_position: float = None):
         """Set the position raw value for left and right sides of the driver.
-        Retry writing to the right side if the left side is successful.
+        How both sides are written is selected by self.sync_mode (see SYNC_MODES); the left/right skew is recorded.
+        :param right_position: Raw position of the right side, if it differs from close_position.
+        :return: (left_success, right_success)
         """
-        # Try writing to the left address first
-        write_left_flag = False
-        write_right_flag = False
-        write_left_flag = self._send_modbus_command(self.left_address, self.pos_register_address, int(close_position)) ##bad
-        
-        write_right_flag = self._send_modbus_command(self.right_address, self.pos_register_address, int(close_position))  ##good
-        
+        left_position = int(close_position)
+        right_position = left_position if right_position is None else int(right_position)
+        if self.command_queue is not None:
+            # Queued, written by the queue's worker at bus speed. The shadow is checked by the worker when it
+            # writes: here it would compare against the last written value, not against what is still pending.
+            if self.sync_mode == "sequential":
+                self.command_queue.submit(self.left_address, self.pos_register_address, left_position)
+                self.command_queue.submit(self.right_address, self.pos_register_address, right_position)
+            else:
+                # One entry for both sides, so the worker writes them together in the selected sync mode
+                self.command_queue.submit((self.left_address, self.right_address), self.pos_register_address,
+                                          (left_position, right_position))
+            return True, True
+        write_left_flag, write_right_flag = self._write_position_pair(left_position, right_position)
+
         # print("write_left_flag", write_left_flag, "write_right_flag", write_right_flag)
         
         if write_left_flag and write_right_flag and verbose:
             print(f"Write to right side successful! Close position: {close_position}")
-        
+        return write_left_flag, write_right_flag
+
+    def _write_position_pair(self, left_position: int, right_position: int):
+        """Write both position registers as selected by self.sync_mode and record the skew.
+        :return: (left_success, right_success)
+        """
+        if (self._shadow_matches(self.left_address, self.pos_register_address, left_position)
+                and self._shadow_matches(self.right_address, self.pos_register_address, right_position)):
+            self.skipped_writes += 2
+            return True, True
+        if self.sync_mode == "broadcast" and left_position == right_position:
+            write_left_flag, write_right_flag, skew = self._write_position_broadcast(left_position)
+        elif self.sync_mode == "pipelined":
+            write_left_flag, write_right_flag, skew = self._write_position_pipelined(left_position, right_position)
+        else:
+            left_time = time.perf_counter()
+            write_left_flag = self._send_modbus_command(self.left_address, self.pos_register_address, left_position) ##bad
+            right_time = time.perf_counter()
+            write_right_flag = self._send_modbus_command(self.right_address, self.pos_register_address, right_position)  ##good
+            skew = right_time - left_time
+        self._record_skew(skew)
+        return write_left_flag, write_right_flag
+
+    def _send_queued(self, slave, register_address: int, value):
+        """Write function of the command queue: a pair of slaves is written with _write_position_pair."""
+        if isinstance(slave, tuple):
+            return self._write_position_pair(*value)
+        return self._send_modbus_command(slave, register_address, value)
+
+    def start_command_queue(self, on_written=None):
+        """Make set_position_raw_direct/set_position_percent non-blocking.
+        Position writes go through a CoalescingCommandQueue that keeps only the newest pending value per gripper.
+        Their (True, True) then only means queued; on_written(slave, register_address, value, ok) is called
+        once each write has been acknowledged or has failed. Unless sync_mode is "sequential", both sides are
+        queued as one entry and written together in that sync mode, with the skew recorded.
+        """
+        if self.command_queue is None:
+            self.command_queue = CoalescingCommandQueue(self, send=self._send_queued)
+            self.command_queue.start()
+        if on_written is not None:
+            self.command_queue.on_written = on_written
+        return self.command_queue
+
+    def stop_command_queue(self, flush: bool = True):
+        if self.command_queue is not None:
+            self.command_queue.stop(flush=flush)
+            self.command_queue = None
+
+    def _write_position_broadcast(self, close_position: int):
+        """One write to the broadcast address: both grippers receive the same frame, so there is no skew.
+        Broadcasts are not answered, so success only means the frame was sent. Needs firmware support,
+        and every other slave on the bus receives the write too.
+        """
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            with self._bus_transaction():
+                self.client.write_register(self.pos_register_address, close_position, slave=BROADCAST_ADDRESS,
+                                           no_response_expected=True)
+        except Exception as e:
+            if self.telemetry is not None:
+                self._record("write_broadcast", BROADCAST_ADDRESS, start, _failure_outcome(e))
+            return False, False, 0.0
+        if self.telemetry is not None:
+            self._record("write_broadcast", BROADCAST_ADDRESS, start, "ok")
+        # Not acknowledged, so the shadow can't be trusted to match
+        self.invalidate_shadow(self.left_address)
+        self.invalidate_shadow(self.right_address)
+        return True, True, 0.0
+
+    def _write_position_pipelined(self, left_position: int, right_position: int):
+        """Transmit the left and right frames back to back, separated only by the RTU silent interval,
+        then collect both echo responses. This relies on the slaves' response delay being longer than
+        one frame time; otherwise the left answer collides with the right request on the half-duplex bus.
+        """
+        left_frame = build_write_register_frame(self.left_address, self.pos_register_address, left_position)
+        right_frame = build_write_register_frame(self.right_address, self.pos_register_address, right_position)
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            with self._bus_transaction():
+                serial = self.client.socket
+                serial.reset_input_buffer()
+                serial.write(left_frame)
+                serial.flush()
+                left_time = time.perf_counter()
+                time.sleep(self.interframe_delay)
+                serial.write(right_frame)
+                serial.flush()
+                right_time = time.perf_counter()
+                response = self._read_exactly(serial, len(left_frame) + len(right_frame))
+        except Exception as e:
+            if self.telemetry is not None:
+                self._record("write_pipelined", self.left_address, start, _failure_outcome(e))
+                self._record("write_pipelined", self.right_address, start, _failure_outcome(e))
+            self.invalidate_shadow()
+            return False, False, 0.0
+        # Write single register responses echo the request
+        write_left_flag = left_frame in response
+        write_right_flag = right_frame in response
+        if self.telemetry is not None:
+            # A full-length response that does not echo a frame was garbled on the line
+            failure = "timeout" if len(response) < len(left_frame) + len(right_frame) else "crc"
+            self._record("write_pipelined", self.left_address, start, "ok" if write_left_flag else failure)
+            self._record("write_pipelined", self.right_address, start, "ok" if write_right_flag else failure)
+        self._update_shadow(self.left_address, self.pos_register_address, left_position, write_left_flag)
+        self._update_shadow(self.right_address, self.pos_register_address, right_position, write_right_flag)
+        return write_left_flag, write_right_flag, right_time - left_time
+
+    def _serial_port(self):
+        """The pyserial port under the client, reopened if pymodbus closed it after an error."""
+        client = self.client
+        if client.socket is None:
+            if not client.connect():
+                raise ConnectionError("Failed to reopen the Modbus serial port.")
+            client = self.client
+        return client.socket
+
+    def _write_position_fast(self, address: int, position: int) -> bool:
+        """Position write through self._fast_frames, see the fast_path argument."""
+        outcome = "ok"
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            with self._bus_transaction(address):
+                flag = self._fast_frames.write(self._serial_port(), address, position)
+            if not flag:
+                outcome = "error"
+        except Exception as e:
+            outcome = _failure_outcome(e)
+            if self.verbose:
+                print(f"An error occurred while sending command: {e}")
+            flag = False
+        if self.telemetry is not None:
+            self._record("write", address, start, outcome)
+        self._update_shadow(address, self.pos_register_address, position, flag)
+        return flag
+
+    def _read_position_fast(self, address: int):
+        """Position read through self._fast_frames: None on an exception response, raises on no or bad response."""
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            with self._bus_transaction(address):
+                value = self._fast_frames.read(self._serial_port(), address)
+        except Exception as e:
+            if self.telemetry is not None:
+                self._record("read", address, start, _failure_outcome(e))
+            raise
+        if self.telemetry is not None:
+            self._record("read", address, start, "ok" if value is not None else "error")
+        return value
+
+    def _read_exactly(self, serial, size: int) -> bytes:
+        """Read up to `size` bytes, giving up after two client timeouts without data."""
+        response = b""
+        deadline = time.perf_counter() + 2 * self.client.comm_params.timeout_connect
+        while len(response) < size and time.perf_counter() < deadline:
+            response += serial.read(size - len(response))
+        return response
+
+    def _record_skew(self, skew: float):
+        self.last_command_skew = skew
+        self._skews.append(skew)
+
+    def get_skew_stats(self) -> dict:
+        """Left/right command skew of the recent set_position_raw_direct calls, in milliseconds."""
+        skews = sorted(self._skews)
+        if not skews:
+            return {"count": 0}
+        return {
+            "mode": self.sync_mode,
+            "count": len(skews),
+            "last_ms": self.last_command_skew * 1000,
+            "mean_ms": sum(skews) / len(skews) * 1000,
+            "p95_ms": skews[min(len(skews) - 1, int(len(skews) * 0.95))] * 1000,
+            "max_ms": skews[-1] * 1000,
+        }
 
 
     def set_position_percent(self, percent_position: float):
         """
         Set the gripper position based on a percentage (0-100).
         0% corresponds to RAW_MIN_POSITION (100), 100% corresponds to RAW_MAX_POSITION (580).
+        :return: (left_success, right_success), None for an invalid percentage.
         """
         if not 0 <= percent_position <= 100:
             print("Invalid percentage value. Position should be between 0 and 100.")
             return
 
         # 映射百分比到实际位置
-        raw_position = self.map_position(percent_position)
+        left_raw_position, right_raw_position = self.map_positions(percent_position)
         
 
         # 设置夹爪位置
-        self.set_position_raw_direct(raw_position)
+        return self.set_position_raw_direct(left_raw_position, right_position=right_raw_position)
+
+    def move_to(self, percent_position: float, tolerance: float = 1.0, timeout: float = 2.0,
+                stall_time: float = 0.1, stall_distance: float = 0.5, min_interval: float = 0.002,
+                max_interval: float = 0.02) -> MoveResult:
+        """Move both grippers to a percentage and block until they are there, stalled or the timeout passed.
+        If a gripper does not acknowledge the position write, MOVE_FAILED is returned right away.
+        :param tolerance: Distance in percent at which the target counts as reached.
+        :param stall_time: A side that moved less than stall_distance percent within this many seconds has stalled.
+        :param min_interval: Shortest time between position reads; the poll rate adapts to the remaining distance.
+        :param max_interval: Longest time between position reads.
+        """
+        if not 0 <= percent_position <= 100:
+            raise ValueError("Invalid percentage value. Position should be between 0 and 100.")
+        tracker = _MoveTracker(self, percent_position, tolerance, stall_time, stall_distance, min_interval, max_interval)
+        left_raw_position, right_raw_position = self.map_positions(percent_position)
+        left_ok, right_ok = self.set_position_raw_direct(left_raw_position, right_position=right_raw_position)
+        if not (left_ok and right_ok):
+            return tracker.result(MOVE_FAILED, None, None)
+        while True:
+            time.sleep(tracker.interval)
+            left_position, right_position = self.read_position(max_staleness=min_interval)
+            status = tracker.update(left_position, right_position)
+            if status is None and tracker.elapsed() >= timeout:
+                status = MOVE_TIMEOUT
+            if status is not None:
+                return tracker.result(status, left_position, right_position)
         
         
 
     def read_PID(self, key, read_num_registers: int = 1):
-        if key == "P":
-            left_PID_P = self._read_modbus_register(self.left_address, self.PID_P_address, read_num_registers)
-            right_PID_P = self._read_modbus_register(self.right_address, self.PID_P_address, read_num_registers)
-            print("left_PID_D ", left_PID_P)
-            print("right_PID_P: ", right_PID_P)
-        elif key == "I":
-            left_PID_I = self._read_modbus_register(self.left_address, self.PID_I_address, read_num_registers)
-            right_PID_I = self._read_modbus_register(self.right_address, self.PID_I_address, read_num_registers)
-            print("left_PID_I: ", left_PID_I)
-            print("right_PID_I: ", right_PID_I)
-        elif key == "D":
-            left_PID_D = self._read_modbus_register(self.left_address, self.PID_I_address, read_num_registers)
-            right_PID_D = self._read_modbus_register(self.right_address, self.PID_I_address, read_num_registers)
-            print("left_PID_D ", left_PID_D)
-            print("right_PID_D: ", right_PID_D)
-        else:
+        """Read one PID gain of both grippers.
+        :param key: "P", "I" or "D".
+        :return: (left_value, right_value), or None if the key is wrong.
+        """
+        if key not in PID_REGISTER_NAMES:
             print("The key of PID control is wrong!")
-        return True
-    
+            return None
+        address = self.register_map[PID_REGISTER_NAMES[key]].address
+        left_pid = self._read_modbus_register(self.left_address, address, read_num_registers)
+        right_pid = self._read_modbus_register(self.right_address, address, read_num_registers)
+        if self.verbose:
+            print(f"left_PID_{key}: ", left_pid)
+            print(f"right_PID_{key}: ", right_pid)
+        return left_pid, right_pid
 
     def set_PID(self, key, value):
-        if key == "P":
-            left_PID_P = self._send_modbus_command(self.left_address, self.PID_P_address, value)
-            right_PID_P = self._send_modbus_command(self.right_address, self.PID_P_address, value)
-            print("left_PID_D ", left_PID_P)
-            print("right_PID_P: ", right_PID_P)
-        elif key == "I":
-            left_PID_I = self._send_modbus_command(self.left_address, self.PID_I_address, value)
-            right_PID_I = self._send_modbus_command(self.right_address, self.PID_I_address, value)
-            print("left_PID_I: ", left_PID_I)
-            print("right_PID_I: ", right_PID_I)
-        elif key == "D":
-            left_PID_D = self._send_modbus_command(self.left_address, self.PID_I_address, value)
-            right_PID_D = self._send_modbus_command(self.right_address, self.PID_I_address, value)
-            print("left_PID_D ", left_PID_D)
-            print("right_PID_D: ", right_PID_D)
-        else:
+        """Write one PID gain of both grippers.
+        :param key: "P", "I" or "D".
+        :return: True if both writes succeeded.
+        """
+        if key not in PID_REGISTER_NAMES:
             print("The key of PID control is wrong!")
+            return False
+        register = self.register_map[PID_REGISTER_NAMES[key]]
+        value = register.validate(value)
+        left_pid = self._send_modbus_command(self.left_address, register.address, value)
+        right_pid = self._send_modbus_command(self.right_address, register.address, value)
+        if self.verbose:
+            print(f"left_PID_{key}: ", left_pid)
+            print(f"right_PID_{key}: ", right_pid)
+        return left_pid and right_pid
+
+    def read_all_info_oneside(self, side_address, verbose=True):
+        """Read all configuration registers of one gripper using block reads.
+        :return: GripperInfo snapshot (unpacks like the former 11-tuple).
+        """
+        values = self.read_registers(side_address, self.INFO_REGISTER_ADDRESSES, read_plan=self.INFO_READ_PLAN)
+        info = GripperInfo(*(values.get(address) for address in self.INFO_REGISTER_ADDRESSES))
+
+        if verbose:
+            self._print_info(side_address, info)
+        return info
+
+
+class AsyncGripperControl(_GripperBase):
+    """asyncio version of GripperControl built on AsyncModbusSerialClient.
+    Every bus access is awaited, so the event loop keeps running other tasks while waiting for the grippers.
+
+        gripper = AsyncGripperControl("/dev/ttyUSB_girpper")
+        await gripper.connect()
+        await gripper.set_position_percent(50)
+        left, right = await gripper.read_position()
+    """
+
+    def __init__(self, port: str, baudrate: int = 115200, raw_max_position: int = 580, raw_min_position: int = 100,
+                 timeout: float = 0.005, left_calibration: GripperCalibration = None,
+                 right_calibration: GripperCalibration = None, telemetry: Telemetry = None, verbose: bool = False):
+        """
+        Initialize the AsyncGripperControl class. The port is opened by connect().
+        :param port: Serial port (e.g., 'COM9').
+        :param baudrate: Baud rate (default is 115200).
+        :param timeout: Response timeout in seconds.
+        :param left_calibration: Percent to raw mapping of the left gripper (default linear RAW_MIN to RAW_MAX).
+        :param right_calibration: Percent to raw mapping of the right gripper (default linear RAW_MIN to RAW_MAX).
+        :param telemetry: Telemetry that counts every request and its latency (None records nothing).
+        :param verbose: Print failed requests.
+        """
+        self._init_settings(port, baudrate, raw_max_position, raw_min_position, left_calibration, right_calibration)
+        self.telemetry = telemetry
+        self.verbose = verbose
+        from pymodbus.client import AsyncModbusSerialClient
+
+        self.client = AsyncModbusSerialClient(port=self.port, baudrate=self.baudrate, timeout=timeout)
+        _watch_framer(self.client.ctx.framer)
+
+    async def connect(self):
+        if not await self.client.connect():
+            raise Exception("Failed to connect to the Modbus device.")
+        if self.verbose:
+            print(f"GripperControl Asynchronous initialized using port and baudrate: {self.port}, {self.baudrate}")
+
+    def close(self):
+        if self.client:
+            self.client.close()
+            if self.verbose:
+                print("Modbus client connection closed.")
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def _send_modbus_command(self, address: int, register_address: int, value: float) -> bool:
+        """Send a Modbus RTU command to the device.
+        :return: True if the command was successful, False otherwise.
+        """
+        await self._wait_interframe()
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            response = await self.client.write_register(register_address, value, slave=address)
+        except Exception as e:
+            if self.telemetry is not None:
+                self._record("write", address, start, _failure_outcome(self._crc_checked(self.client.ctx.framer, e)))
+            if self.verbose:
+                print(f"An error occurred while sending command: {e}")
+            return False
+        finally:
+            self._mark_frame_end()
+        if self.telemetry is not None:
+            self._record("write", address, start, "error" if response.isError() else "ok")
+        if response.isError():
+            if self.verbose:
+                print(f"Error: {response.message}")
+            return False
         return True
 
+    async def _wait_interframe(self):
+        """Wait out the silent interval before a request."""
+        import asyncio
 
+        wait_time = self._interframe_wait_time()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        self.client.ctx.framer.crc_failed = False  # a new request starts
 
-    def read_all_info_oneside(self, side_address, verbose=True):
-        pos = self._read_modbus_register(id_address=side_address, register_address=self.POS_REGISTER_ADDRESS, num_registers=1)
-        speed = self._read_modbus_register(id_address=side_address, register_address=self.SPEED_REGISTER_ADDRESS, num_registers=1)
-        loop_mode = self._read_modbus_register(id_address=side_address, register_address=self.LOOP_MODE_REGISTER_ADDRESS, num_registers=1)
-        target_writeback = self._read_modbus_register(id_address=side_address, register_address=self.TARGET_WRITEBACK_REGISTER_ADDRESS, num_registers=1)
-        polarity = self._read_modbus_register(id_address=side_address, register_address=self.POLARITY_REGISTER_ADDRESS, num_registers=1)
-        target_lock = self._read_modbus_register(id_address=side_address, register_address=self.TARGET_LOCK_REGISTER_ADDRESS, num_registers=1)
-        pid_p = self._read_modbus_register(id_address=side_address, register_address=self.PID_P_REGISTER_ADDRESS, num_registers=1)
-        pid_i = self._read_modbus_register(id_address=side_address, register_address=self.PID_I_REGISTER_ADDRESS, num_registers=1)
-        pid_d = self._read_modbus_register(id_address=side_address, register_address=self.PID_D_REGISTER_ADDRESS, num_registers=1)
-        deadzone = self._read_modbus_register(id_address=side_address, register_address=self.DEADZONE_REGISTER_ADDRESS, num_registers=1)
-        max_torque = self._read_modbus_register(id_address=side_address, register_address=self.MAX_TORQUE_REGISTER_ADDRESS, num_registers=1)
+    async def _read_modbus_register(self, id_address: int, register_address: int, num_registers: int):
+        """Read a Modbus register value from the device."""
+        await self._wait_interframe()
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            response = await self.client.read_holding_registers(register_address, count=num_registers, slave=id_address)
+        except Exception as e:
+            if self.telemetry is not None:
+                self._record("read", id_address, start, _failure_outcome(self._crc_checked(self.client.ctx.framer, e)))
+            raise
+        finally:
+            self._mark_frame_end()
+        if self.telemetry is not None:
+            self._record("read", id_address, start, "error" if response.isError() else "ok")
+        if response.isError():
+            if self.verbose:
+                print(f"Read Error: {response}")
+            return None
+        return self.client.convert_from_registers(response.registers, self.client.DATATYPE.UINT16)
 
-        if verbose:
-            # print all info
-            print(f"-------- Side {side_address} --------")
-            print(f"Position: {pos}")
-            print(f"Speed: {speed}")
-            print(f"Loop Mode: {loop_mode}")
-            print(f"Target Writeback: {target_writeback}")
-            print(f"Polarity: {polarity}")
-            print(f"Target Lock: {target_lock}")
-            print(f"PID P: {pid_p}")
-            print(f"PID I: {pid_i}")
-            print(f"PID D: {pid_d}")
-            print(f"Deadzone: {deadzone}")
-            print(f"Max Torque: {max_torque}")
-            print("-------------------------------")
-        return pos, speed, loop_mode, target_writeback, polarity, target_lock, pid_p, pid_i, pid_d, deadzone, max_torque
+    async def _read_register_block(self, id_address: int, start_address: int, count: int):
+        """Read `count` consecutive holding registers in one request.
+        :return: List of register values, or None if the device rejected the request. Raises if it did not answer.
+        """
+        await self._wait_interframe()
+        start = time.perf_counter() if self.telemetry is not None else 0.0
+        try:
+            response = await self.client.read_holding_registers(start_address, count=count, slave=id_address)
+        except Exception as e:
+            if self.telemetry is not None:
+                outcome = _failure_outcome(self._crc_checked(self.client.ctx.framer, e))
+                self._record("read_block", id_address, start, outcome)
+            raise
+        finally:
+            self._mark_frame_end()
+        if self.telemetry is not None:
+            self._record("read_block", id_address, start, "error" if response.isError() else "ok")
+        if response.isError():
+            return None
+        return list(response.registers)
+
+    async def read_registers(self, id_address: int, register_addresses, read_plan=None, max_gap: int = BLOCK_READ_MAX_GAP):
+        """Read a set of registers with the minimum number of block reads, see GripperControl.read_registers."""
+        wanted = set(register_addresses)
+        values = dict.fromkeys(wanted)
+        if read_plan is None:
+            read_plan = plan_block_reads(wanted, max_gap=max_gap)
+        for start, count in read_plan:
+            try:
+                registers = await self._read_register_block(id_address, start, count)
+                if registers is None and count > 1:
+                    registers = [
+                        await self._read_modbus_register(id_address, start + i, 1) if start + i in wanted else None
+                        for i in range(count)
+                    ]
+            except Exception as e:
+                if self.verbose:
+                    print(f"An error occurred while reading registers: {e}")
+                break
+            for i in range(count):
+                if start + i in wanted:
+                    values[start + i] = registers[i] if registers is not None else None
+        return values
+
+    async def read_register(self, slave: int, name: str):
+        """Read one register of the register map by name, see GripperControl.read_register."""
+        register = self.register_map[name]
+        return register.decode(await self._read_modbus_register(slave, register.address, 1))
+
+    async def write_register(self, slave: int, name: str, value: int) -> bool:
+        """Write one register of the register map by name, see GripperControl.write_register."""
+        register = self.register_map[name]
+        return await self._send_modbus_command(slave, register.address, register.validate(value))
+
+    async def read_named_registers(self, slave: int, names=None) -> dict:
+        """Read registers of the register map (default all) with the precomputed block read plan."""
+        names = self.register_map.names() if names is None else tuple(names)
+        values = await self.read_registers(slave, self.register_map.addresses(names),
+                                           read_plan=self.register_map.read_plan(names))
+        return {name: self.register_map[name].decode(values.get(self.register_map[name].address)) for name in names}
+
+    async def read_position(self, read_num_registers: int = 1):
+        """Read the current position of both left and right grippers."""
+        try:
+            left_position = await self._read_modbus_register(self.left_address, self.pos_register_address, read_num_registers)
+            right_position = await self._read_modbus_register(self.right_address, self.pos_register_address, read_num_registers)
+        except Exception as e:
+            if self.verbose:
+                print(f"An error occurred while reading position: {e}")
+            return None, None
 
+        return left_position, right_position
+
+    async def set_speed(self, speed: int):
+        """
+        Set the maximum speed for both left and right grippers.
+        :param speed: Target speed value (range 200-1023).
+        """
+        register = self.register_map["speed"]
+        if not register.minimum <= speed <= register.maximum:
+            print(f"Error: Speed value must be between {register.minimum} and {register.maximum}.")
+            return
+        left_speed = await self._send_modbus_command(self.left_address, self.speed_register_address, speed)
+        right_speed = await self._send_modbus_command(self.right_address, self.speed_register_address, speed)
+        return left_speed, right_speed
+
+    async def set_position_raw_direct(self, close_position: float, verbose=False, right_position: float = None):
+        """Set the position raw value for left and right sides of the driver.
+        :param right_position: Raw position of the right side, if it differs from close_position.
+        """
+        right_position = close_position if right_position is None else right_position
+        write_left_flag = await self._send_modbus_command(self.left_address, self.pos_register_address, int(close_position))
+        write_right_flag = await self._send_modbus_command(self.right_address, self.pos_register_address, int(right_position))
+        if write_left_flag and write_right_flag and verbose:
+            print(f"Write to right side successful! Close position: {close_position}")
+        return write_left_flag, write_right_flag
+
+    async def set_position_percent(self, percent_position: float):
+        """
+        Set the gripper position based on a percentage (0-100).
+        0% corresponds to RAW_MIN_POSITION (100), 100% corresponds to RAW_MAX_POSITION (580).
+        """
+        if not 0 <= percent_position <= 100:
+            print("Invalid percentage value. Position should be between 0 and 100.")
+            return
+        left_raw_position, right_raw_position = self.map_positions(percent_position)
+        return await self.set_position_raw_direct(left_raw_position, right_position=right_raw_position)
+
+    async def move_to(self, percent_position: float, tolerance: float = 1.0, timeout: float = 2.0,
+                      stall_time: float = 0.1, stall_distance: float = 0.5, min_interval: float = 0.002,
+                      max_interval: float = 0.02) -> MoveResult:
+        """Move both grippers to a percentage and wait until they are there, stalled or the timeout passed.
+        See GripperControl.move_to for the parameters.
+        """
+        if not 0 <= percent_position <= 100:
+            raise ValueError("Invalid percentage value. Position should be between 0 and 100.")
+        import asyncio
+
+        tracker = _MoveTracker(self, percent_position, tolerance, stall_time, stall_distance, min_interval, max_interval)
+        left_raw_position, right_raw_position = self.map_positions(percent_position)
+        left_ok, right_ok = await self.set_position_raw_direct(left_raw_position, right_position=right_raw_position)
+        if not (left_ok and right_ok):
+            return tracker.result(MOVE_FAILED, None, None)
+        while True:
+            await asyncio.sleep(tracker.interval)
+            left_position, right_position = await self.read_position()
+            status = tracker.update(left_position, right_position)
+            if status is None and tracker.elapsed() >= timeout:
+                status = MOVE_TIMEOUT
+            if status is not None:
+                return tracker.result(status, left_position, right_position)
+
+    async def set_PID(self, key, value):
+        if key not in PID_REGISTER_NAMES:
+            print("The key of PID control is wrong!")
+            return False
+        register = self.register_map[PID_REGISTER_NAMES[key]]
+        value = register.validate(value)
+        left_pid = await self._send_modbus_command(self.left_address, register.address, value)
+        right_pid = await self._send_modbus_command(self.right_address, register.address, value)
+        return left_pid and right_pid
+
+    async def read_all_info_oneside(self, side_address, verbose=True):
+        """Read all configuration registers of one gripper using block reads.
+        :return: GripperInfo snapshot.
+        """
+        values = await self.read_registers(side_address, self.INFO_REGISTER_ADDRESSES, read_plan=self.INFO_READ_PLAN)
+        info = GripperInfo(*(values.get(address) for address in self.INFO_REGISTER_ADDRESSES))
+        if verbose:
+            self._print_info(side_address, info)
+        return info
@@ -0,0 +1,136 @@
+"""Several grippers on several serial lines, one I/O worker thread per line.
+
+    bus = GripperBus()
+    bus.add_gripper("cell1_left", "/dev/ttyUSB0", 2)
+    bus.add_gripper("cell1_right", "/dev/ttyUSB0", 10)
+    bus.add_gripper("cell2_left", "/dev/ttyUSB1", 2)
+    bus.set_positions_percent({"cell1_left": 50, "cell2_left": 80})  # both lines in parallel
+    print(bus.read_positions())
+    bus.close()
+
+Requests for one line are queued to that line's worker and executed in order, so lines never wait for each other.
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+from calibration import GripperCalibration
+from e_gripper_mudbus_control_one_init import GripperControl
+
+
+class GripperAddress(NamedTuple):
+    port: str
+    slave_id: int
+
+
+class _PortWorker:
+    """One serial line: its GripperControl connection and the single thread that does its I/O."""
+
+    def __init__(self, port: str, baudrate: int, timeout: float):
+        self.control = GripperControl(port=port, baudrate=baudrate, timeout=timeout)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"gripper-bus-{port}")
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.control.close()
+
+
+class GripperBus:
+    def __init__(self, baudrate: int = 115200, timeout: float = 0.005):
+        """
+        :param baudrate: Default baud rate of the ports added with add_gripper.
+        :param timeout: Default response timeout of the ports.
+        """
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.grippers = {}  # name -> GripperAddress
+        self.calibrations = {}  # name -> GripperCalibration
+        self._workers = {}  # port -> _PortWorker
+
+    def add_port(self, port: str, baudrate: int = None, timeout: float = None):
+        """Open a serial line. add_gripper opens unknown ports with the bus defaults."""
+        if port not in self._workers:
+            self._workers[port] = _PortWorker(
+                port,
+                baudrate if baudrate is not None else self.baudrate,
+                timeout if timeout is not None else self.timeout,
+            )
+        return self._workers[port].control
+
+    def add_gripper(self, name: str, port: str, slave_id: int, calibration: GripperCalibration = None):
+        """Register a gripper under `name` at (port, slave_id)."""
+        if name in self.grippers:
+            raise ValueError(f"Gripper {name!r} is already registered.")
+        control = self.add_port(port)
+        self.grippers[name] = GripperAddress(port, slave_id)
+        self.calibrations[name] = calibration if calibration is not None else control.left_calibration
+
+    def close(self):
+        for worker in self._workers.values():
+            worker.close()
+        self._workers = {}
+
+    def _submit(self, name: str, method: str, *args):
+        address = self.grippers[name]
+        worker = self._workers[address.port]
+        return worker.submit(getattr(worker.control, method), address.slave_id, *args)
+
+    # Asynchronous requests, each returns a concurrent.futures.Future
+
+    def submit_write(self, name: str, register_address: int, value: int):
+        """Queue a register write. The future resolves to True on success."""
+        return self._submit(name, "_send_modbus_command", register_address, int(value))
+
+    def submit_read(self, name: str, register_address: int, num_registers: int = 1):
+        """Queue a register read. The future resolves to the value (None on a Modbus error)."""
+        return self._submit(name, "_read_modbus_register", register_address, num_registers)
+
+    # Blocking helpers that fan out over all lines and wait for the results
+
+    def set_positions_percent(self, targets: dict, timeout: float = None) -> dict:
+        """Set several grippers at once, e.g. {"cell1_left": 50, "cell2_left": 80}.
+        :return: {name: success}
+        """
+        futures = {}
+        for name, percent in targets.items():
+            if not 0 <= percent <= 100:
+                raise ValueError(f"Invalid percentage value {percent} for {name!r}.")
+            raw_position = self.calibrations[name].to_raw(percent)
+            futures[name] = self.submit_write(name, self._pos_register(name), raw_position)
+        return self._collect(futures, timeout)
+
+    def set_position_percent(self, name: str, percent: float) -> bool:
+        return self.set_positions_percent({name: percent})[name]
+
+    def read_positions(self, names=None, timeout: float = None) -> dict:
+        """Read the raw position of several grippers (default all).
+        :return: {name: raw position or None}
+        """
+        names = list(self.grippers) if names is None else names
+        futures = {name: self.submit_read(name, self._pos_register(name)) for name in names}
+        return self._collect(futures, timeout)
+
+    def read_position(self, name: str):
+        return self.read_positions([name])[name]
+
+    def _pos_register(self, name: str) -> int:
+        return self._workers[self.grippers[name].port].control.POS_REGISTER_ADDRESS
+
+    @staticmethod
+    def _collect(futures: dict, timeout: float) -> dict:
+        wait(futures.values(), timeout=timeout)
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(timeout=0) if future.done() else None
+            except Exception:
+                results[name] = None
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,158 @@
+"""Command line access to both grippers, fast enough to call in shell loops.
+
+    python gripper_cli.py read                 # "100 100"
+    python gripper_cli.py set 40 --wait        # "reached 212.4 ms 292 292"
+    python gripper_cli.py info --json
+    python gripper_cli.py bench --iterations 200
+    python gripper_cli.py --simulate read      # against the built-in simulator
+    python gripper_cli.py --capture s.bin bench  # record the bus traffic ...
+    python gripper_cli.py --replay s.bin bench   # ... and run against the recording later
+
+Heavy modules (pymodbus, asyncio, NumPy) are only imported by the subcommands that need them, and the
+serial port is opened on the first bus access.
+"""
+_PROCESS_START = __import__("time").perf_counter()
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+DEFAULT_PORT = os.environ.get("GRIPPER_PORT", "/dev/ttyUSB_girpper")
+
+
+def _gripper(args):
+    from e_gripper_mudbus_control_one_init import GripperControl
+
+    capture = transport = None
+    if args.capture:
+        from bus_capture import BusCapture
+
+        capture = BusCapture(args.capture, baudrate=args.baudrate)
+    if args.replay:
+        from bus_capture import ReplaySerial
+
+        transport = ReplaySerial(args.replay, realtime=not args.replay_fast)
+    return GripperControl(port=args.port, baudrate=args.baudrate, timeout=args.timeout, capture=capture,
+                          transport=transport)
+
+
+def cmd_read(args, gripper):
+    left, right = gripper.read_position()
+    if args.percent:
+        left = None if left is None else round(gripper.left_calibration.to_percent(left), 1)
+        right = None if right is None else round(gripper.right_calibration.to_percent(right), 1)
+    print(left, right)
+    return 0 if left is not None and right is not None else 1
+
+
+def cmd_set(args, gripper):
+    if not 0 <= args.percent <= 100:
+        print("Invalid percentage value. Position should be between 0 and 100.", file=sys.stderr)
+        return 2
+    if not args.wait:
+        left_raw, right_raw = gripper.map_positions(args.percent)
+        left_ok, right_ok = gripper.set_position_raw_direct(left_raw, right_position=right_raw)
+        print("ok" if left_ok and right_ok else "failed")
+        return 0 if left_ok and right_ok else 1
+    result = gripper.move_to(args.percent, tolerance=args.tolerance, timeout=args.move_timeout)
+    print(result.status, f"{result.settle_time * 1000:.1f} ms", result.left, result.right)
+    return 0 if result.status in ("reached", "stalled") else 1
+
+
+def cmd_info(args, gripper):
+    sides = {"left": gripper.left_address, "right": gripper.right_address}
+    names = sides if args.side == "both" else [args.side]
+    infos = {name: gripper.read_all_info_oneside(sides[name], verbose=not args.json) for name in names}
+    if args.json:
+        print(json.dumps({name: info._asdict() for name, info in infos.items()}))
+    return 0 if all(None not in info for info in infos.values()) else 1
+
+
+def cmd_bench(args, gripper):
+    """Startup cost and position read latency, as seen by a short-lived script."""
+    ready = time.perf_counter()
+    gripper.connect()
+    opened = time.perf_counter()
+    latencies = []
+    failures = 0
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        left, right = gripper.read_position()
+        latencies.append(time.perf_counter() - start)
+        failures += left is None or right is None
+    latencies.sort()
+    result = {
+        "startup_ms": (ready - _PROCESS_START) * 1000,
+        "connect_ms": (opened - ready) * 1000,  # pymodbus import and port open
+        "read_mean_ms": sum(latencies) / len(latencies) * 1000,
+        "read_p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "read_max_ms": latencies[-1] * 1000,
+        "failures": failures,
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Read and command the grippers.")
+    parser.add_argument("--port", default=DEFAULT_PORT, help="Serial port (default $GRIPPER_PORT or %(default)s)")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--timeout", type=float, default=0.005, help="Response timeout in seconds")
+    parser.add_argument("--simulate", action="store_true", help="Talk to gripper_simulator instead of --port")
+    parser.add_argument("--capture", metavar="PATH", help="Record every frame on the bus to this file")
+    parser.add_argument("--replay", metavar="PATH", help="Answer from a --capture recording instead of --port")
+    parser.add_argument("--replay-fast", action="store_true", help="Replay without the recorded response delays")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    read = subparsers.add_parser("read", help="Print the left and right positions")
+    read.add_argument("--percent", action="store_true", help="Print percent instead of raw positions")
+    read.set_defaults(handler=cmd_read)
+
+    set_ = subparsers.add_parser("set", help="Move both grippers to a percentage")
+    set_.add_argument("percent", type=float)
+    set_.add_argument("--wait", action="store_true", help="Wait until reached or stalled (move_to)")
+    set_.add_argument("--tolerance", type=float, default=1.0, help="Percent counted as reached with --wait")
+    set_.add_argument("--move-timeout", type=float, default=2.0, help="Seconds to wait with --wait")
+    set_.set_defaults(handler=cmd_set)
+
+    info = subparsers.add_parser("info", help="Print all configuration registers")
+    info.add_argument("--side", choices=("left", "right", "both"), default="both")
+    info.add_argument("--json", action="store_true")
+    info.set_defaults(handler=cmd_info)
+
+    bench = subparsers.add_parser("bench", help="Measure startup and position read latency")
+    bench.add_argument("--iterations", type=int, default=100)
+    bench.add_argument("--json", action="store_true")
+    bench.set_defaults(handler=cmd_bench)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    simulator = None
+    if args.simulate:
+        from gripper_simulator import GripperSimulator
+
+        simulator = GripperSimulator()
+        args.port = simulator.start()
+        args.timeout = max(args.timeout, 0.02)
+    gripper = _gripper(args)
+    try:
+        return args.handler(args, gripper)
+    finally:
+        gripper.close()
+        if gripper.capture is not None:
+            gripper.capture.close()
+        if simulator is not None:
+            simulator.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""Share one gripper port between processes.
+
+The daemon owns the serial port, polls both grippers and publishes the latest snapshot into a
+multiprocessing.shared_memory block guarded by a seqlock. Any process on the machine reads the snapshot
+straight from shared memory, without serial traffic or a round trip to the daemon. Commands travel the other
+way over a one-way multiprocessing.connection channel and are executed by the daemon:
+
+    python gripper_daemon.py --port /dev/ttyUSB_girpper
+
+    client = GripperClient()  # in any other process
+    left, right = client.read_position()
+    client.set_position_percent(40)
+
+Commands are unpickled by the daemon, so the channel is private to the user running it: the socket is 0600
+(by default in a 0700 directory of its own), and connections must know a random authkey that the daemon
+writes to a 0600 file next to the socket (<address>.key), where clients of the same user read it.
+
+The seqlock relies on stores becoming visible in program order, which holds on x86; on weakly ordered
+CPUs a torn read is still detected most of the time but is not strictly excluded.
+"""
+import argparse
+import os
+import secrets
+import struct
+import tempfile
+import threading
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from multiprocessing.shared_memory import SharedMemory
+from typing import NamedTuple
+
+
+DEFAULT_NAME = "gripper_state"
+DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), f"gripper_daemon-{os.getuid()}", "daemon.sock")
+MISSING = -1  # published for positions that could not be read
+
+# GripperControl methods clients may call, all fire-and-forget. Blocking calls such as move_to are left out:
+# they would hold up the commands behind them on the connection and poll the bus beside the poll loop.
+# Clients wait for a move by watching the snapshot instead.
+COMMANDS = frozenset({
+    "set_position_percent",
+    "set_position_raw_direct",
+    "set_speed",
+    "set_PID",
+    "set_pos_lock",
+})
+
+_SEQUENCE = struct.Struct("<Q")  # even: snapshot stable, odd: being written
+_BODY = struct.Struct("<diiiiBIQQ")
+_BODY_OFFSET = _SEQUENCE.size
+SHARED_MEMORY_SIZE = _BODY_OFFSET + _BODY.size
+
+
+class GripperSnapshot(NamedTuple):
+    sequence: int
+    timestamp: float  # time.monotonic() of the position read, comparable across processes
+    left: int  # raw positions, MISSING if the read failed
+    right: int
+    left_target: int  # last commanded raw positions, MISSING before the first command
+    right_target: int
+    connected: bool
+    read_errors: int
+    samples: int
+    commands: int
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.timestamp
+
+
+def authkey_path(address: str) -> str:
+    return address + ".key"
+
+
+def _socket_directory(path: str):
+    """Create the socket's directory as 0700 if missing. An existing one is used as is, unless another user owns it
+    (and could swap the socket and key file).
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path, mode=0o700)
+    elif os.stat(path).st_uid not in (os.getuid(), 0):
+        raise PermissionError(f"{path} belongs to another user; pass an address in a directory of your own.")
+
+
+def _write_authkey(path: str) -> bytes:
+    authkey = secrets.token_bytes(32)
+    descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "wb") as file:
+        os.fchmod(file.fileno(), 0o600)  # the file may have existed with other permissions
+        file.write(authkey)
+    return authkey
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to an existing block without letting this process' resource tracker unlink it at exit."""
+    try:
+        return SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shared_memory = SharedMemory(name=name)
+        resource_tracker.unregister(shared_memory._name, "shared_memory")
+        return shared_memory
+
+
+class GripperDaemon:
+    def __init__(self, gripper, name: str = DEFAULT_NAME, address: str = DEFAULT_ADDRESS,
+                 rate_hz: float = 100.0, coalesce: bool = True):
+        """
+        :param gripper: GripperControl that owns the port.
+        :param name: Name of the shared memory block.
+        :param address: Unix socket path the command channel listens on. A missing directory is created as 0700.
+        :param rate_hz: Position polling and publishing rate.
+        :param coalesce: Write position commands through the gripper's command queue, so a burst of
+            commands never delays the polling by more than one write.
+        """
+        self.gripper = gripper
+        self.name = name
+        self.address = address
+        self.period = 1.0 / rate_hz
+        self.coalesce = coalesce
+        self._shared_memory = None
+        self._listener = None
+        self._stop = threading.Event()
+        self._threads = []
+        self._sequence = 0
+        self._targets = (MISSING, MISSING)
+        self.read_errors = 0
+        self.samples = 0
+        self.commands = 0
+
+    def start(self):
+        self._shared_memory = SharedMemory(name=self.name, create=True, size=SHARED_MEMORY_SIZE)
+        self._publish(MISSING, MISSING, False)
+        if self.coalesce:
+            self.gripper.start_command_queue(on_written=self._written)
+        _socket_directory(os.path.dirname(os.path.abspath(self.address)))
+        if os.path.exists(self.address):
+            # Left over by a daemon that died; a running one would already own the shared memory name
+            os.unlink(self.address)
+        authkey = _write_authkey(authkey_path(self.address))  # a new key per run
+        umask = os.umask(0o177)  # the socket is 0600 from the moment it is bound
+        try:
+            self._listener = Listener(self.address, family="AF_UNIX", authkey=authkey)
+        finally:
+            os.umask(umask)
+        self._stop.clear()
+        for target in (self._poll_loop, self._accept_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.close()  # unblocks accept()
+            self._listener = None
+            if os.path.exists(authkey_path(self.address)):
+                os.unlink(authkey_path(self.address))
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+        if self.coalesce:
+            self.gripper.stop_command_queue()
+        if self._shared_memory is not None:
+            self._shared_memory.close()
+            self._shared_memory.unlink()
+            self._shared_memory = None
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _publish(self, left: int, right: int, connected: bool):
+        buffer = self._shared_memory.buf
+        # Seqlock: readers retry while the sequence is odd or changed during their read
+        self._sequence += 1
+        _SEQUENCE.pack_into(buffer, 0, self._sequence)
+        _BODY.pack_into(buffer, _BODY_OFFSET, time.monotonic(), left, right, *self._targets, connected,
+                        self.read_errors, self.samples, self.commands)
+        self._sequence += 1
+        _SEQUENCE.pack_into(buffer, 0, self._sequence)
+
+    def _poll_loop(self):
+        next_time = time.perf_counter()
+        while not self._stop.is_set():
+            left, right = self.gripper._read_position_from_bus()
+            connected = left is not None and right is not None
+            if connected:
+                self.samples += 1
+            else:
+                self.read_errors += 1
+            self._publish(MISSING if left is None else left, MISSING if right is None else right, connected)
+            next_time += self.period
+            wait_time = next_time - time.perf_counter()
+            if wait_time > 0:
+                self._stop.wait(wait_time)
+            else:
+                next_time = time.perf_counter()
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                connection = self._listener.accept()
+            except AuthenticationError:
+                print("Rejected a gripper daemon connection with a wrong authkey")
+                continue
+            except Exception:
+                return  # listener closed
+            thread = threading.Thread(target=self._serve_connection, args=(connection,), daemon=True)
+            thread.start()
+
+    def _serve_connection(self, connection):
+        with connection:
+            while not self._stop.is_set():
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+                self._execute(method, args)
+
+    def _execute(self, method: str, args: tuple):
+        if method not in COMMANDS:
+            print(f"Ignoring unknown gripper command {method!r}")
+            return
+        self.commands += 1
+        try:
+            result = getattr(self.gripper, method)(*args)
+        except Exception as e:
+            print(f"Gripper command {method}{args} failed: {e}")
+            return
+        if method not in ("set_position_percent", "set_position_raw_direct") or result is None:
+            return  # not a position command, or rejected before anything was sent
+        if self.coalesce:
+            return  # only queued: the target is published by _written once the write is acknowledged
+        if method == "set_position_percent":
+            targets = self.gripper.map_positions(args[0])
+        else:
+            left = int(args[0])
+            targets = (left, int(args[2]) if len(args) > 2 and args[2] is not None else left)
+        # Only the sides whose write was accepted have a new target
+        self._targets = tuple(target if ok else old for target, ok, old in zip(targets, result, self._targets))
+
+    def _written(self, slave: int, register_address: int, value: int, ok: bool):
+        """Command queue callback: an acknowledged position write is the new target of its side."""
+        if not ok or register_address != self.gripper.pos_register_address:
+            return
+        left, right = self._targets
+        if slave == self.gripper.left_address:
+            left = value
+        if slave == self.gripper.right_address:
+            right = value
+        self._targets = (left, right)
+
+
+class GripperClient:
+    def __init__(self, name: str = DEFAULT_NAME, address: str = DEFAULT_ADDRESS):
+        """Reader of a GripperDaemon's snapshot and sender of its commands (connected on the first command,
+        with the authkey the daemon wrote next to its socket).
+        """
+        self._shared_memory = _attach(name)
+        self._buffer = self._shared_memory.buf
+        self.address = address
+        self._connection = None
+
+    def snapshot(self, max_spins: int = 100000) -> GripperSnapshot:
+        """Consistent copy of the latest snapshot, read directly from shared memory."""
+        buffer = self._buffer
+        for _ in range(max_spins):
+            (before,) = _SEQUENCE.unpack_from(buffer, 0)
+            if before & 1:
+                continue
+            body = _BODY.unpack_from(buffer, _BODY_OFFSET)
+            (after,) = _SEQUENCE.unpack_from(buffer, 0)
+            if before == after:
+                return GripperSnapshot(before, *body[:5], bool(body[5]), *body[6:])
+        raise RuntimeError("The gripper daemon snapshot never became stable; did the daemon die while publishing?")
+
+    def read_position(self):
+        """(left, right) raw positions of the latest snapshot, None where the daemon's read failed."""
+        snapshot = self.snapshot()
+        return (None if snapshot.left == MISSING else snapshot.left,
+                None if snapshot.right == MISSING else snapshot.right)
+
+    def send(self, method: str, *args):
+        """Queue a GripperControl call (one of COMMANDS) in the daemon. Does not wait for it to run."""
+        if self._connection is None:
+            with open(authkey_path(self.address), "rb") as file:
+                authkey = file.read()
+            self._connection = Client(self.address, family="AF_UNIX", authkey=authkey)
+        self._connection.send((method, args))
+
+    def set_position_percent(self, percent_position: float):
+        self.send("set_position_percent", percent_position)
+
+    def set_position_raw_direct(self, close_position: float, right_position: float = None):
+        self.send("set_position_raw_direct", close_position, False, right_position)
+
+    def set_speed(self, speed: int):
+        self.send("set_speed", speed)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self._buffer = None
+        self._shared_memory.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    from e_gripper_mudbus_control_one_init import GripperControl
+
+    parser = argparse.ArgumentParser(description="Own the gripper port and share its state with other processes.")
+    parser.add_argument("--port", default="/dev/ttyUSB_girpper")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    parser.add_argument("--name", default=DEFAULT_NAME, help="Shared memory block name")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="Unix socket of the command channel")
+    parser.add_argument("--rate", type=float, default=100.0, help="Polling rate in Hz")
+    args = parser.parse_args()
+
+    gripper = GripperControl(port=args.port, baudrate=args.baudrate)
+    daemon = GripperDaemon(gripper, name=args.name, address=args.address, rate_hz=args.rate)
+    print(f"Publishing gripper state to shared memory {args.name!r}, commands on {args.address}")
+    daemon.serve_forever()
+    gripper.close()
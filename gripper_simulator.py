@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Simulated grippers answering Modbus RTU on a pseudo terminal or a TCP socket.
+
+Lets GripperControl, the examples and the benchmarks run without hardware:
+
+    with GripperSimulator(latency=0.002, drop_rate=0.01) as simulator:
+        gripper = GripperControl(simulator.port)
+
+or from a shell:
+
+% ./gripper_simulator.py --latency 0.002
+Simulated grippers (slaves 2, 10) on /dev/pts/5
+"""
+import argparse
+import os
+import random
+import select
+import socket
+import struct
+import threading
+import time
+import tty
+
+from modbus_rtu import (
+    BROADCAST_ADDRESS,
+    READ_HOLDING_REGISTERS,
+    WRITE_SINGLE_REGISTER,
+    add_crc,
+    check_crc,
+)
+
+
+WRITE_MULTIPLE_REGISTERS = 0x10
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+
+# Register map and defaults from the README
+DEFAULT_REGISTERS = {
+    2: 100,  # Position
+    3: 1000,  # Maxspeed
+    4: 0,  # LoopMode
+    6: 1,  # TargetWriteback
+    7: 0,  # Polarity
+    8: 1,  # TargetLock
+    9: 50,  # PID_P
+    10: 5,  # PID_I
+    11: 0,  # PID_D
+    14: 15,  # Deadzone
+    15: 800,  # MaxTorque
+}
+POSITION_REGISTER = 2
+SPEED_REGISTER = 3
+
+
+class SimulatedGripper:
+    def __init__(self, slave_id: int, speed_scale: float = 1.0, strict_register_map: bool = False):
+        """
+        One gripper: a holding register table plus a position that moves toward the written target.
+        :param speed_scale: Raw position units per second for each unit of the Maxspeed register.
+        :param strict_register_map: Reject reads and writes that touch registers outside the README map.
+        """
+        self.slave_id = slave_id
+        self.speed_scale = speed_scale
+        self.strict_register_map = strict_register_map
+        self.registers = dict(DEFAULT_REGISTERS)
+        self.position = float(self.registers[POSITION_REGISTER])
+        self.target = self.position
+        self._last_update = time.perf_counter()
+
+    def update(self):
+        now = time.perf_counter()
+        step = self.registers[SPEED_REGISTER] * self.speed_scale * (now - self._last_update)
+        self._last_update = now
+        if abs(self.target - self.position) <= step:
+            self.position = self.target
+        else:
+            self.position += step if self.target > self.position else -step
+
+    def read(self, address: int, count: int):
+        """:return: Register values, or an exception code."""
+        self.update()
+        values = []
+        for register in range(address, address + count):
+            if register == POSITION_REGISTER:
+                values.append(int(round(self.position)))
+            elif register in self.registers:
+                values.append(self.registers[register])
+            elif self.strict_register_map:
+                return ILLEGAL_DATA_ADDRESS
+            else:
+                values.append(0)
+        return values
+
+    def write(self, address: int, value: int):
+        """:return: None on success, or an exception code."""
+        if address not in self.registers and self.strict_register_map:
+            return ILLEGAL_DATA_ADDRESS
+        self.update()
+        self.registers[address] = value
+        if address == POSITION_REGISTER:
+            self.target = float(value)
+        return None
+
+
+class GripperSimulator:
+    def __init__(self, slave_ids=(2, 10), latency: float = 0.0, latency_jitter: float = 0.0, drop_rate: float = 0.0,
+                 transport: str = "pty", tcp_port: int = 0, speed_scale: float = 1.0,
+                 strict_register_map: bool = False, seed: int = None):
+        """
+        Simulated Modbus RTU bus with one SimulatedGripper per slave id.
+        :param latency: Delay before every response, in seconds.
+        :param latency_jitter: Extra uniformly distributed delay (0 to latency_jitter seconds).
+        :param drop_rate: Probability that a request is silently not answered.
+        :param transport: "pty" (serial port path) or "tcp" (socket://host:port URL, also accepted by pyserial).
+            Prefer "pty" for latency measurements: pyserial's socket:// in_waiting only reports 0 or 1 byte,
+            which slows down pymodbus' response detection.
+        :param tcp_port: TCP port to listen on, 0 picks a free one.
+        """
+        if transport not in ("pty", "tcp"):
+            raise ValueError("transport must be 'pty' or 'tcp'")
+        self.grippers = {
+            slave_id: SimulatedGripper(slave_id, speed_scale, strict_register_map) for slave_id in slave_ids
+        }
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.drop_rate = drop_rate
+        self.transport = transport
+        self.tcp_port = tcp_port
+        self.port = None
+        self.stats = {"requests": 0, "responses": 0, "dropped": 0, "crc_errors": 0, "exceptions": 0}
+        self._random = random.Random(seed)
+        self._stop = threading.Event()
+        self._thread = None
+        self._fds = []
+
+    def start(self) -> str:
+        """Start serving on a background thread.
+        :return: Port to pass to GripperControl.
+        """
+        if self.transport == "pty":
+            master, slave = os.openpty()
+            tty.setraw(slave)
+            self._fds = [master, slave]  # keep the slave side open so the pty survives client reconnects
+            self.port = os.ttyname(slave)
+            target = self._serve_pty
+        else:
+            self._server = socket.create_server(("127.0.0.1", self.tcp_port))
+            self.tcp_port = self._server.getsockname()[1]
+            self.port = f"socket://127.0.0.1:{self.tcp_port}"
+            target = self._serve_tcp
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+        if self.transport == "tcp":
+            self._server.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _serve_pty(self):
+        master = self._fds[0]
+        buffer = bytearray()
+        while not self._stop.is_set():
+            if not select.select([master], [], [], 0.05)[0]:
+                continue
+            try:
+                buffer += os.read(master, 256)
+            except OSError:  # no client has the port open
+                time.sleep(0.01)
+                continue
+            for response in self._handle_bytes(buffer):
+                os.write(master, response)
+
+    def _serve_tcp(self):
+        self._server.settimeout(0.05)
+        while not self._stop.is_set():
+            try:
+                connection, _address = self._server.accept()
+            except socket.timeout:
+                continue
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            buffer = bytearray()
+            with connection:
+                while not self._stop.is_set():
+                    if not select.select([connection], [], [], 0.05)[0]:
+                        continue
+                    data = connection.recv(256)
+                    if not data:
+                        break
+                    buffer += data
+                    for response in self._handle_bytes(buffer):
+                        connection.sendall(response)
+
+    def _handle_bytes(self, buffer: bytearray):
+        """Consume complete request frames from `buffer` and yield the responses to send."""
+        while len(buffer) >= 8:
+            function_code = buffer[1]
+            if function_code == WRITE_MULTIPLE_REGISTERS:
+                size = 9 + buffer[6] if len(buffer) >= 7 else None
+            elif function_code in (READ_HOLDING_REGISTERS, WRITE_SINGLE_REGISTER):
+                size = 8
+            else:
+                size = len(buffer)  # unknown function, resynchronize on the next burst
+            if size is None or len(buffer) < size:
+                return
+            frame = bytes(buffer[:size])
+            del buffer[:size]
+            if not check_crc(frame):
+                self.stats["crc_errors"] += 1
+                buffer.clear()
+                return
+            response = self._handle_frame(frame)
+            if response is not None:
+                delay = self.latency + self._random.uniform(0, self.latency_jitter)
+                if delay > 0:
+                    time.sleep(delay)
+                self.stats["responses"] += 1
+                yield response
+
+    def _handle_frame(self, frame: bytes):
+        slave_id, function_code = frame[0], frame[1]
+        if slave_id == BROADCAST_ADDRESS:
+            targets = list(self.grippers.values())
+        elif slave_id in self.grippers:
+            targets = [self.grippers[slave_id]]
+        else:
+            return None  # another slave on the bus
+        self.stats["requests"] += 1
+        if self._random.random() < self.drop_rate:
+            self.stats["dropped"] += 1
+            return None
+
+        if function_code == READ_HOLDING_REGISTERS and slave_id != BROADCAST_ADDRESS:
+            address, count = struct.unpack(">HH", frame[2:6])
+            if not 1 <= count <= 125:
+                return self._exception(slave_id, function_code, ILLEGAL_DATA_VALUE)
+            values = targets[0].read(address, count)
+            if isinstance(values, int):
+                return self._exception(slave_id, function_code, values)
+            return add_crc(struct.pack(f">BBB{count}H", slave_id, function_code, 2 * count, *values))
+        if function_code == WRITE_SINGLE_REGISTER:
+            address, value = struct.unpack(">HH", frame[2:6])
+            errors = [gripper.write(address, value) for gripper in targets]
+            if slave_id == BROADCAST_ADDRESS:
+                return None  # broadcasts are never answered
+            if errors[0] is not None:
+                return self._exception(slave_id, function_code, errors[0])
+            return frame
+        if function_code == WRITE_MULTIPLE_REGISTERS:
+            address, count = struct.unpack(">HH", frame[2:6])
+            values = struct.unpack(f">{count}H", frame[7:7 + 2 * count])
+            errors = [
+                gripper.write(address + i, value) for gripper in targets for i, value in enumerate(values)
+            ]
+            if slave_id == BROADCAST_ADDRESS:
+                return None
+            error = next((error for error in errors if error is not None), None)
+            if error is not None:
+                return self._exception(slave_id, function_code, error)
+            return add_crc(frame[:6])
+        return self._exception(slave_id, function_code, ILLEGAL_FUNCTION)
+
+    def _exception(self, slave_id: int, function_code: int, code: int) -> bytes:
+        self.stats["exceptions"] += 1
+        return add_crc(bytes((slave_id, function_code | 0x80, code)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transport", choices=("pty", "tcp"), default="pty")
+    parser.add_argument("--tcp-port", type=int, default=5020)
+    parser.add_argument("--latency", type=float, default=0.0, help="response delay in seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="extra random delay in seconds")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability of not answering a request")
+    parser.add_argument("--strict-register-map", action="store_true")
+    args = parser.parse_args()
+
+    simulator = GripperSimulator(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        drop_rate=args.drop_rate,
+        transport=args.transport,
+        tcp_port=args.tcp_port,
+        strict_register_map=args.strict_register_map,
+    )
+    port = simulator.start()
+    print(f"Simulated grippers (slaves {', '.join(map(str, simulator.grippers))}) on {port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+        print(simulator.stats)
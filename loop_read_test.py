@@ -1,11 +1,21 @@
 from e_gripper_mudbus_control_one_init import GripperControl
+from telemetry import Telemetry
 import time
 if __name__ == "__main__":
     
-    gripper = GripperControl(port="/dev/ttyUSB_girpper", baudrate=115200)
+    telemetry = Telemetry()
+    gripper = GripperControl(port="/dev/ttyUSB_girpper", baudrate=115200, telemetry=telemetry)
     result = gripper._read_modbus_register(id_address=2, register_address=2, num_registers=1)
-    while True:
-        time.sleep(0.001)
-        left_position, right_position = gripper.read_position()
-        print(f"Left Position: {left_position}")
-        print(f"Right Position: {right_position}")
+    gripper.start_position_poller(rate_hz=100)
+    last_print = 0.0
+    try:
+        while True:
+            time.sleep(0.001)
+            left_position, right_position = gripper.read_position(max_staleness=0.05)
+            # Printing every iteration would make stdout the bottleneck, report at 10 Hz instead
+            if time.perf_counter() - last_print >= 0.1:
+                last_print = time.perf_counter()
+                print(f"Left Position: {left_position}, Right Position: {right_position}")
+    except KeyboardInterrupt:
+        print(telemetry.to_json(indent=2))
+        gripper.close()
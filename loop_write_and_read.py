@@ -1,21 +1,34 @@
 from e_gripper_mudbus_control_one_init import GripperControl
+from data_logger import DataLogger, ERROR_LEFT_WRITE, ERROR_RIGHT_WRITE, ERROR_LEFT_READ, ERROR_RIGHT_READ
 import time
 if __name__ == "__main__":
     
     gripper = GripperControl(port="/dev/ttyUSB_girpper", baudrate=115200)
     result = gripper._read_modbus_register(id_address=2, register_address=2, num_registers=1)
+    gripper.start_position_poller(rate_hz=100)
+    # Record to runs/<time>/, load it with data_logger.load_run()
+    logger = DataLogger(time.strftime("runs/%Y%m%d_%H%M%S"))
+    logger.start()
     start_pose = 0
     increment = 1
     current_pose = start_pose
-    while True:
-        time.sleep(0.001)
-        current_pose += increment
-        print(f"Current Pose: {current_pose}")
-        gripper.set_position_percent(int(current_pose))
-        left_position, right_position = gripper.read_position()
-        print(f"Left Position: {left_position}")
-        print(f"Right Position: {right_position}")
-        if int(current_pose) >= 100:
-            increment = -1
-        if int(current_pose) <= 0:
-            increment = 1
+    try:
+        while True:
+            time.sleep(0.001)
+            current_pose += increment
+            left_command, right_command = gripper.map_positions(int(current_pose))
+            start = time.perf_counter()
+            left_ok, right_ok = gripper.set_position_raw_direct(left_command, right_position=right_command)
+            left_position, right_position = gripper.read_position(max_staleness=0.05)
+            latency = time.perf_counter() - start
+            errors = ((not left_ok) * ERROR_LEFT_WRITE | (not right_ok) * ERROR_RIGHT_WRITE
+                      | (left_position is None) * ERROR_LEFT_READ | (right_position is None) * ERROR_RIGHT_READ)
+            logger.log(start, left_command, right_command, left_position, right_position, latency, errors)
+            if int(current_pose) >= 100:
+                increment = -1
+            if int(current_pose) <= 0:
+                increment = 1
+    except KeyboardInterrupt:
+        logger.close()
+        print(f"Logged to {logger.directory}")
+        gripper.close()
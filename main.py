@@ -1,5 +1,5 @@
 from e_gripper_mudbus_control_one_init import GripperControl
-import time
+from trajectory import TrajectoryExecutor, chain, minimum_jerk
 
 if __name__ == "__main__":
     # Serial port settings
@@ -11,10 +11,17 @@ if __name__ == "__main__":
     speed = 1022
     position = [100, 20, 100, 10]
     # Example usage
-    for _ in range(4):
-        for i in position:
-            gripper.set_position_percent(i)
-            time.sleep(0.5) 
+    # Smooth minimum-jerk moves through the positions, 0.5 s each, four times through the list.
+    # The first setpoint is position[0], as when each position was commanded in turn.
+    executor = TrajectoryExecutor(gripper)
+    waypoints = position * 4
+    moves = [minimum_jerk(start, end, duration=0.5) for start, end in zip(waypoints, waypoints[1:])]
+    result = executor.execute(chain(*moves))
+    print(f"Sent {result.sent} setpoints, {result.missed_deadlines} missed deadlines")
+
+    # Grasp: returns as soon as the grippers reach 10% or stop on the object, instead of a fixed sleep
+    grasp = gripper.move_to(10, timeout=1.0)
+    print(f"Grasp {grasp.status} after {grasp.settle_time * 1000:.0f} ms at {grasp.left}, {grasp.right}")
 
     # gripper.set_position_percent(80)
     # # gripper.set_position_percent(70)  # Close grippers to position range is [100, 555], max=560
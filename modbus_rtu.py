@@ -0,0 +1,142 @@
+"""Minimal Modbus RTU framing helpers for the paths that talk to the serial port directly."""
+import struct
+from typing import Optional
+
+
+READ_HOLDING_REGISTERS = 0x03
+WRITE_SINGLE_REGISTER = 0x06
+BROADCAST_ADDRESS = 0
+
+
+def _make_crc16_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC16_TABLE = _make_crc16_table()
+
+
+def crc16(data) -> int:
+    """Modbus CRC16 (polynomial 0xA001, initial value 0xFFFF), table driven."""
+    crc = 0xFFFF
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def add_crc(pdu: bytes) -> bytes:
+    """Append the CRC (low byte first) to an address + PDU."""
+    return pdu + struct.pack("<H", crc16(pdu))
+
+
+def check_crc(frame) -> bool:
+    return len(frame) >= 4 and crc16(frame[:-2]) == frame[-2] | (frame[-1] << 8)
+
+
+def build_write_register_frame(slave: int, register_address: int, value: int) -> bytes:
+    """Function 0x06 request. The slave answers with an identical echo frame."""
+    return add_crc(struct.pack(">BBHH", slave, WRITE_SINGLE_REGISTER, register_address, value))
+
+
+def build_read_holding_registers_frame(slave: int, register_address: int, count: int) -> bytes:
+    """Function 0x03 request. The response is 5 + 2 * count bytes long."""
+    return add_crc(struct.pack(">BBHH", slave, READ_HOLDING_REGISTERS, register_address, count))
+
+
+class RtuTimeout(IOError):
+    """The slave did not answer with a complete frame within the port timeout."""
+
+
+class RtuCrcError(IOError):
+    """A response frame failed its CRC check."""
+
+
+class SingleRegisterFrames:
+    """Preallocated single register write/read transactions on one holding register of any slave.
+
+    The read request of a slave never changes and is built once. The write request is a template in which only
+    the value and CRC bytes are patched, continuing the CRC of the constant header. Responses land in one reused
+    buffer, so apart from pyserial's own read buffer a transaction allocates nothing:
+
+        frames = SingleRegisterFrames(2)
+        frames.write(serial, 10, 300)   # True once the slave echoed the frame
+        frames.read(serial, 10)         # 300
+    """
+
+    def __init__(self, register_address: int, slaves=()):
+        self.register_address = register_address
+        self._read_requests = {}  # slave -> request frame
+        self._write_requests = {}  # slave -> (request template, CRC of its first four bytes)
+        self._response = bytearray(8)  # longest response: the write echo
+        self._view = memoryview(self._response)
+        for slave in slaves:
+            self._prepare(slave)
+
+    def _prepare(self, slave: int):
+        self._read_requests[slave] = build_read_holding_registers_frame(slave, self.register_address, 1)
+        header = struct.pack(">BBH", slave, WRITE_SINGLE_REGISTER, self.register_address)
+        template = bytearray(8)
+        template[:4] = header
+        entry = self._write_requests[slave] = (template, crc16(header))
+        return entry
+
+    def write(self, serial, slave: int, value: int) -> bool:
+        """Write value and wait for the echo.
+        :return: True if echoed, False on an exception response. :raise RtuTimeout, RtuCrcError:
+        """
+        entry = self._write_requests.get(slave)
+        frame, crc = entry if entry is not None else self._prepare(slave)
+        high = (value >> 8) & 0xFF
+        low = value & 0xFF
+        table = CRC16_TABLE
+        crc = (crc >> 8) ^ table[(crc ^ high) & 0xFF]
+        crc = (crc >> 8) ^ table[(crc ^ low) & 0xFF]
+        frame[4] = high
+        frame[5] = low
+        frame[6] = crc & 0xFF
+        frame[7] = crc >> 8
+        serial.reset_input_buffer()
+        serial.write(frame)
+        if not self._receive(serial, slave, 8):
+            return False
+        return self._response == frame
+
+    def read(self, serial, slave: int) -> Optional[int]:
+        """:return: The register value, None on an exception response. :raise RtuTimeout, RtuCrcError:"""
+        request = self._read_requests.get(slave)
+        if request is None:
+            self._prepare(slave)
+            request = self._read_requests[slave]
+        serial.reset_input_buffer()
+        serial.write(request)
+        if not self._receive(serial, slave, 7):
+            return None
+        response = self._response
+        return (response[3] << 8) | response[4]
+
+    def _receive(self, serial, slave: int, size: int) -> bool:
+        """Read a response of `size` bytes into the buffer. :return: False for a (5 byte) exception response."""
+        view = self._view
+        # An exception response is 5 bytes long, so read those first and only then the rest
+        self._read_into(serial, view[:5])
+        exception = self._response[1] & 0x80
+        if not exception:
+            self._read_into(serial, view[5:size])
+        end = 5 if exception else size
+        if crc16(view[:end - 2]) != self._response[end - 2] | (self._response[end - 1] << 8):
+            raise RtuCrcError(f"CRC error in the response of slave {slave}")
+        if self._response[0] != slave:
+            raise IOError(f"Response from slave {self._response[0]} while waiting for slave {slave}")
+        return not exception
+
+    @staticmethod
+    def _read_into(serial, view):
+        # pyserial's read (behind readinto) keeps reading until the view is full or the port timeout expires
+        if serial.readinto(view) < len(view):
+            raise RtuTimeout("No response (timeout) from the slave")
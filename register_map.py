@@ -0,0 +1,173 @@
+"""Declarative holding register table of the gripper, the single source of register addresses.
+
+Every register is declared once with its address, valid range, type and access. Range checks, block
+read plans and the typed per-gripper accessors are all derived from the table:
+
+    GRIPPER_REGISTERS["speed"].address        # 3
+    GRIPPER_REGISTERS.read_plan(["pid_p", "pid_i", "pid_d"])  # [(9, 3)]
+    gripper.left.set_speed(800)               # validated before anything is sent
+    gripper.right.get_pid_d()
+"""
+from typing import NamedTuple
+
+
+BLOCK_READ_MAX_GAP = 2  # Unused registers tolerated inside one block read
+BLOCK_READ_MAX_COUNT = 125  # Modbus limit for read_holding_registers
+
+READ_ONLY = "r"
+READ_WRITE = "rw"
+
+
+def plan_block_reads(register_addresses, max_gap: int = BLOCK_READ_MAX_GAP, max_count: int = BLOCK_READ_MAX_COUNT):
+    """Coalesce register addresses into as few block reads as possible.
+    :param register_addresses: Iterable of holding register addresses.
+    :param max_gap: Maximum number of unused registers allowed between two wanted ones.
+    :param max_count: Maximum number of registers in one request.
+    :return: List of (start_address, count) tuples.
+    """
+    blocks = []
+    for address in sorted(set(register_addresses)):
+        if blocks:
+            start, count = blocks[-1]
+            end = start + count - 1
+            if address - end - 1 <= max_gap and address - start + 1 <= max_count:
+                blocks[-1] = (start, address - start + 1)
+                continue
+        blocks.append((address, 1))
+    return blocks
+
+
+class Register(NamedTuple):
+    name: str
+    address: int
+    minimum: int = 0
+    maximum: int = 0xFFFF
+    type: str = "uint16"  # "uint16" or "int16"
+    access: str = READ_WRITE
+    description: str = ""
+
+    @property
+    def writable(self) -> bool:
+        return "w" in self.access
+
+    def validate(self, value) -> int:
+        """:return: value as the int to write. :raise ValueError: if read-only or out of range."""
+        if not self.writable:
+            raise ValueError(f"Register {self.name} is read-only.")
+        value = int(value)
+        if not self.minimum <= value <= self.maximum:
+            raise ValueError(f"{self.name} must be between {self.minimum} and {self.maximum}, got {value}.")
+        return value if self.type != "int16" or value >= 0 else value + 0x10000
+
+    def decode(self, raw):
+        """Register value as read from the bus (None stays None)."""
+        if raw is not None and self.type == "int16" and raw >= 0x8000:
+            return raw - 0x10000
+        return raw
+
+
+class RegisterMap:
+    def __init__(self, registers):
+        self.registers = tuple(registers)
+        self._by_name = {}
+        self._by_address = {}
+        for register in self.registers:
+            if register.name in self._by_name or register.address in self._by_address:
+                raise ValueError(f"Register {register.name} at {register.address} is declared twice.")
+            self._by_name[register.name] = register
+            self._by_address[register.address] = register
+        self._plans = {}
+
+    def __getitem__(self, name: str) -> Register:
+        return self._by_name[name]
+
+    def __iter__(self):
+        return iter(self.registers)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def at(self, address: int) -> Register:
+        """Register at a holding register address (None if not in the table)."""
+        return self._by_address.get(address)
+
+    def names(self):
+        return tuple(register.name for register in self.registers)
+
+    def addresses(self, names=None):
+        """Addresses of the named registers (default all), in the given order."""
+        names = self.names() if names is None else names
+        return tuple(self._by_name[name].address for name in names)
+
+    def read_plan(self, names=None, max_gap: int = BLOCK_READ_MAX_GAP):
+        """Block reads covering the named registers (default all). Plans are computed once and cached."""
+        key = (None if names is None else tuple(names), max_gap)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = plan_block_reads(self.addresses(names), max_gap=max_gap)
+        return plan
+
+
+# Register map and defaults are listed in the README ("Value in each register")
+GRIPPER_REGISTERS = RegisterMap([
+    Register("position", 2, description="Target position when written, measured position when read"),
+    Register("speed", 3, 200, 1023, description="最高速度-Maxspeed"),
+    Register("loop_mode", 4, description="循环模式-LoopMode"),
+    Register("target_writeback", 6, 0, 1, description="目标回写-TargetWriteback"),
+    Register("polarity", 7, 0, 1, description="极性-Polarity"),
+    Register("target_lock", 8, 0, 1, description="目标锁定-TargetLock"),
+    Register("pid_p", 9, description="PID P gain"),
+    Register("pid_i", 10, description="PID I gain"),
+    Register("pid_d", 11, description="PID D gain"),
+    Register("deadzone", 14, description="死区-Deadzone"),
+    Register("max_torque", 15, description="最大扭矩-MaxTorque"),
+])
+
+
+class RegisterAccessor:
+    """Registers of one gripper. make_accessor_class adds a get_<name>() per register and a set_<name>(value)
+    per writable one, which go through the control's read_register/write_register (awaitable on the async control).
+    """
+
+    def __init__(self, control, slave: int):
+        self.control = control
+        self.slave = slave
+
+    def read_all(self, names=None):
+        """Read the named registers (default all) in the fewest block reads. :return: {name: value}"""
+        return self.control.read_named_registers(self.slave, names)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(slave={self.slave})"
+
+
+def _make_getter(register: Register):
+    def getter(self) -> int:
+        return self.control.read_register(self.slave, register.name)
+
+    getter.__name__ = f"get_{register.name}"
+    getter.__doc__ = f"Read {register.name} (register {register.address}). {register.description}"
+    return getter
+
+
+def _make_setter(register: Register):
+    def setter(self, value: int) -> bool:
+        return self.control.write_register(self.slave, register.name, value)
+
+    setter.__name__ = f"set_{register.name}"
+    setter.__doc__ = (f"Write {register.name} (register {register.address}, {register.minimum}-{register.maximum}). "
+                      f"{register.description}")
+    return setter
+
+
+def make_accessor_class(register_map: RegisterMap, name: str = "GripperRegisters"):
+    """Build a RegisterAccessor subclass with the typed getters and setters of register_map."""
+    namespace = {}
+    for register in register_map:
+        namespace[f"get_{register.name}"] = _make_getter(register)
+        if register.writable:
+            namespace[f"set_{register.name}"] = _make_setter(register)
+    return type(name, (RegisterAccessor,), namespace)
+
+
+GripperRegisters = make_accessor_class(GRIPPER_REGISTERS)
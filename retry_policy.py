@@ -0,0 +1,93 @@
+import random
+import time
+
+
+def rtu_silent_interval(baudrate: int, bits_per_char: int = 11) -> float:
+    """Modbus RTU inter-frame silent interval (3.5 character times) in seconds.
+    Above 19200 baud the spec fixes it at 1.75 ms.
+    :param bits_per_char: Start + 8 data + parity/stop bits (11 for 8E1/8N2, 10 for 8N1).
+    """
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * bits_per_char / baudrate
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.0005, max_delay: float = 0.01,
+                 multiplier: float = 2.0, jitter: float = 0.5, deadline: float = 0.1):
+        """
+        Bounded retry with exponential, jittered backoff.
+        :param max_attempts: Maximum number of attempts, including the first one.
+        :param base_delay: Backoff before the first retry, in seconds.
+        :param max_delay: Upper bound of a single backoff, in seconds.
+        :param multiplier: Growth factor of the backoff per retry.
+        :param jitter: Fraction of each backoff that is randomized (0 = none, 1 = full jitter).
+        :param deadline: Give up once this much time has passed since the first attempt (None = no deadline).
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+
+    def backoff(self, retry: int) -> float:
+        """Delay before retry number `retry` (1-based)."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def run(self, attempt, stats=None):
+        """Call `attempt()` until it returns a truthy value or the policy gives up.
+        :param stats: Optional RetryStats that records the attempts and latency of this call.
+        :return: (result of the last attempt, number of attempts)
+        """
+        start = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            result = attempt()
+            if result or attempts >= self.max_attempts:
+                break
+            delay = self.backoff(attempts)
+            if self.deadline is not None and time.perf_counter() + delay - start > self.deadline:
+                break
+            time.sleep(delay)
+        if stats is not None:
+            stats.record(attempts, time.perf_counter() - start, bool(result))
+        return result, attempts
+
+
+class RetryStats:
+    """Attempt counts and latencies of the calls made through a RetryPolicy."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.attempts_histogram = {}  # attempts per call -> number of calls
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, attempts: int, latency: float, success: bool):
+        self.calls += 1
+        self.retries += attempts - 1
+        if not success:
+            self.failures += 1
+        self.attempts_histogram[attempts] = self.attempts_histogram.get(attempts, 0) + 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "attempts_histogram": dict(sorted(self.attempts_histogram.items())),
+            "mean_latency_ms": self.total_latency / self.calls * 1000 if self.calls else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
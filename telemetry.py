@@ -0,0 +1,104 @@
+"""Per-operation, per-slave counters and latency histograms for the gripper bus.
+
+    telemetry = Telemetry()
+    gripper = GripperControl(port, telemetry=telemetry)
+    ...
+    print(telemetry.to_json())
+    open("gripper.prom", "w").write(telemetry.to_prometheus())
+
+GripperControl only records when a Telemetry is attached (the check is a single `is not None`), and a
+Telemetry created with enabled=False returns from record() immediately.
+"""
+import json
+import threading
+from bisect import bisect_left
+
+
+# Upper bounds of the latency histogram buckets, in seconds (a last +Inf bucket is implicit)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+OUTCOMES = ("ok", "error", "timeout", "crc")
+
+
+class _OperationStats:
+    __slots__ = ("count", "outcomes", "buckets", "total_latency", "max_latency")
+
+    def __init__(self):
+        self.count = 0
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+
+class Telemetry:
+    def __init__(self, enabled: bool = True):
+        """
+        :param enabled: Record anything at all. Can be toggled at runtime.
+        """
+        self.enabled = enabled
+        self._stats = {}  # (operation, slave) -> _OperationStats
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, slave: int, latency: float, outcome: str = "ok"):
+        """Count one bus operation.
+        :param outcome: One of OUTCOMES: "ok", "error" (exception response or failure), "timeout" or "crc"
+            (a response arrived but failed the CRC check, also when pymodbus then waited out the timeout).
+        """
+        if not self.enabled:
+            return
+        key = (operation, slave)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _OperationStats()
+            stats.count += 1
+            stats.outcomes[outcome] += 1
+            stats.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            stats.total_latency += latency
+            if latency > stats.max_latency:
+                stats.max_latency = latency
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def snapshot(self) -> dict:
+        """{operation: {slave: {count, ok, error, timeout, crc, mean_ms, max_ms, histogram}}}
+        The histogram maps each bucket upper bound in milliseconds ("inf" for the rest) to a count.
+        """
+        result = {}
+        with self._lock:
+            for (operation, slave), stats in sorted(self._stats.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                labels = [f"{bound * 1000:g}" for bound in LATENCY_BUCKETS] + ["inf"]
+                result.setdefault(operation, {})[slave] = {
+                    "count": stats.count,
+                    **stats.outcomes,
+                    "mean_ms": stats.total_latency / stats.count * 1000 if stats.count else 0.0,
+                    "max_ms": stats.max_latency * 1000,
+                    "histogram": dict(zip(labels, stats.buckets)),
+                }
+        return result
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "gripper_modbus") -> str:
+        """Prometheus text exposition format (counters per outcome and a latency histogram)."""
+        lines = [
+            f"# TYPE {prefix}_requests_total counter",
+            f"# TYPE {prefix}_latency_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: (item[0][0], str(item[0][1])))
+            for (operation, slave), stats in items:
+                labels = f'operation="{operation}",slave="{slave}"'
+                for outcome, count in stats.outcomes.items():
+                    lines.append(f'{prefix}_requests_total{{{labels},outcome="{outcome}"}} {count}')
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), stats.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f'{prefix}_latency_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{prefix}_latency_seconds_sum{{{labels}}} {stats.total_latency}")
+                lines.append(f"{prefix}_latency_seconds_count{{{labels}}} {stats.count}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,24 @@
+"""Run with: python -m pytest test_adaptive_timeout.py"""
+from adaptive_timeout import AdaptiveTimeout
+from e_gripper_mudbus_control_one_init import GripperControl
+from gripper_simulator import GripperSimulator
+
+
+def test_calibration_with_dropped_responses_tracks_the_real_rtt():
+    with GripperSimulator(drop_rate=0.3, seed=1) as simulator:
+        lossless = GripperControl(simulator.port, timeout_estimator=AdaptiveTimeout(initial=0.02))
+        simulator.drop_rate = 0.0
+        lossless.calibrate_timeouts(samples=20)
+        real_rtt = max(stats["srtt_ms"] for stats in lossless.timeout_estimator.stats().values())
+        lossless.close()
+
+        simulator.drop_rate = 0.3
+        gripper = GripperControl(simulator.port, timeout_estimator=AdaptiveTimeout(initial=0.02))
+        gripper.calibrate_timeouts(samples=40)
+        stats = gripper.timeout_estimator.stats()
+        gripper.close()
+
+    for slave_stats in stats.values():
+        assert slave_stats["timeouts"] > 0  # losses reach the estimator instead of being retried away
+        assert slave_stats["srtt_ms"] < 3 * real_rtt + 1.0
+        assert slave_stats["timeout_ms"] < 50.0
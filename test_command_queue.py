@@ -0,0 +1,16 @@
+"""Run with: python -m pytest test_command_queue.py"""
+from e_gripper_mudbus_control_one_init import GripperControl
+from gripper_simulator import GripperSimulator
+
+
+def test_queued_setpoint_equal_to_the_last_written_one_is_not_skipped():
+    with GripperSimulator(latency=0.02) as simulator:
+        gripper = GripperControl(simulator.port, timeout=0.1)
+        gripper.set_position_raw_direct(200)
+        gripper.start_command_queue()
+        for position in (400, 450, 200):  # the newest command goes back to the written value
+            gripper.set_position_raw_direct(position)
+        gripper.stop_command_queue(flush=True)
+        targets = [simulator.grippers[slave].target for slave in (gripper.left_address, gripper.right_address)]
+        gripper.close()
+    assert targets == [200, 200]
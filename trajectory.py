@@ -0,0 +1,101 @@
+"""Stream timed gripper setpoints on a deadline-driven schedule.
+
+    executor = TrajectoryExecutor(gripper)
+    result = executor.execute(minimum_jerk(100, 20, duration=0.5))
+    print(result.missed_deadlines, result.max_lateness)
+"""
+import time
+from typing import NamedTuple
+
+
+def minimum_jerk(start_percent: float, end_percent: float, duration: float, rate_hz: float = 100.0):
+    """Yield (time, percent) waypoints of a minimum-jerk move from start_percent to end_percent.
+    :param duration: Duration of the move in seconds.
+    :param rate_hz: Waypoint rate.
+    """
+    steps = max(1, int(round(duration * rate_hz)))
+    for i in range(steps + 1):
+        tau = i / steps
+        shape = tau ** 3 * (10 - 15 * tau + 6 * tau ** 2)
+        yield tau * duration, start_percent + (end_percent - start_percent) * shape
+
+
+def chain(*segments):
+    """Concatenate waypoint sequences whose times each start at 0 into one timeline."""
+    offset = 0.0
+    for segment in segments:
+        t = 0.0
+        for t, percent in segment:
+            yield offset + t, percent
+        offset += t
+
+
+class TrajectoryResult(NamedTuple):
+    sent: int  # setpoints written to the grippers
+    skipped: int  # setpoints dropped because a later one was already due
+    failed: int  # setpoints where a gripper did not acknowledge the write
+    missed_deadlines: int  # setpoints that completed later than their deadline + tolerance
+    max_lateness: float  # seconds, worst completion time past a deadline
+    mean_command_latency: float  # seconds per set_position_raw_direct call
+    duration: float  # seconds from start to the last completed setpoint
+
+
+class TrajectoryExecutor:
+    def __init__(self, gripper, skip_late: bool = True, late_tolerance: float = 0.002, latency_smoothing: float = 0.2):
+        """
+        Execute (time, percent) waypoints on a GripperControl.
+        Each setpoint is sent early by the smoothed bus latency so that it completes at its deadline.
+        :param skip_late: Skip a setpoint when the next one is already due, instead of falling further behind.
+        :param late_tolerance: Lateness in seconds still counted as on time.
+        :param latency_smoothing: Weight of the newest sample in the command latency estimate.
+        """
+        self.gripper = gripper
+        self.skip_late = skip_late
+        self.late_tolerance = late_tolerance
+        self.latency_smoothing = latency_smoothing
+        self.estimated_latency = 0.0
+
+    def execute(self, waypoints) -> TrajectoryResult:
+        """Stream waypoints (a sequence or generator of (seconds from start, percent)) to both grippers."""
+        sent = skipped = failed = missed = 0
+        max_lateness = 0.0
+        total_latency = 0.0
+        start = time.perf_counter()
+        completed = start
+        iterator = iter(waypoints)
+        pending = next(iterator, None)
+        while pending is not None:
+            t, percent = pending
+            pending = next(iterator, None)
+            deadline = start + t
+            if self.skip_late and pending is not None and time.perf_counter() + self.estimated_latency > start + pending[0]:
+                skipped += 1
+                continue
+
+            wait_time = deadline - self.estimated_latency - time.perf_counter()
+            if wait_time > 0:
+                time.sleep(wait_time)
+
+            send_time = time.perf_counter()
+            left_raw, right_raw = self.gripper.map_positions(min(100.0, max(0.0, percent)))
+            left_ok, right_ok = self.gripper.set_position_raw_direct(left_raw, right_position=right_raw)
+            completed = time.perf_counter()
+
+            latency = completed - send_time
+            self.estimated_latency += self.latency_smoothing * (latency - self.estimated_latency)
+            total_latency += latency
+            sent += 1
+            failed += not (left_ok and right_ok)
+            lateness = completed - deadline
+            max_lateness = max(max_lateness, lateness)
+            missed += lateness > self.late_tolerance
+
+        return TrajectoryResult(
+            sent=sent,
+            skipped=skipped,
+            failed=failed,
+            missed_deadlines=missed,
+            max_lateness=max_lateness,
+            mean_command_latency=total_latency / sent if sent else 0.0,
+            duration=completed - start,
+        )